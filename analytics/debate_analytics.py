@@ -1,22 +1,42 @@
 from __future__ import annotations
 
 import json
-from collections import defaultdict
+import os
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from dataclasses import dataclass, asdict
-from datetime import datetime
+from datetime import datetime, timezone
 from pathlib import Path
 from typing import List, Dict, Any, Optional, Tuple
 
-import networkx as nx
 import pandas as pd
 from langfuse.openai import OpenAI
+from pydantic import TypeAdapter
 
-from council.types import DebateState, Argument, Vote
+from council.types import DebateState, Vote
+
+# Arguments scored per sentiment request, and max concurrent requests sent to Ollama
+SENTIMENT_BATCH_SIZE = 20
+SENTIMENT_WORKERS = 16
+
+# Built once: constructing the validator is the expensive part of parse_obj_as
+_DEBATE_STATE_ADAPTER = TypeAdapter(DebateState)
 
 
 @dataclass
 class AgentStats:
     """Statistics for a single agent"""
+    __slots__ = (
+        "name",
+        "total_arguments",
+        "avg_focus_score",
+        "first_place_votes",
+        "total_votes_received",
+        "win_rate",
+        "avg_argument_length",
+        "participations",
+    )
+
     name: str
     total_arguments: int
     avg_focus_score: float
@@ -30,6 +50,19 @@ class AgentStats:
 @dataclass
 class DebateAnalytics:
     """Comprehensive analytics for a debate"""
+    __slots__ = (
+        "debate_id",
+        "question",
+        "total_iterations",
+        "consensus_reached",
+        "winner",
+        "agent_stats",
+        "voting_matrix",
+        "argument_graph_data",
+        "sentiment_scores",
+        "iteration_consensus_scores",
+    )
+
     debate_id: str
     question: str
     total_iterations: int
@@ -85,7 +118,7 @@ class DebateAnalyzer:
             DebateAnalytics with complete insights
         """
         # Extract basic info
-        debate_id = f"debate_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}"
+        debate_id = f"debate_{datetime.now(timezone.utc).strftime('%Y%m%d_%H%M%S')}"
         question = state.config.question
         total_iterations = len(state.iterations)
         consensus_reached = state.iterations[-1].consensus_reached if state.iterations else False
@@ -121,19 +154,17 @@ class DebateAnalyzer:
 
     def _calculate_agent_stats(self, state: DebateState) -> Dict[str, AgentStats]:
         """Calculate performance statistics for each agent"""
-        stats = {}
-
-        # Collect all arguments per agent
-        agent_arguments: Dict[str, List[Argument]] = defaultdict(list)
-        for iteration in state.iterations:
-            for arg in iteration.arguments:
-                agent_arguments[arg.author].append(arg)
-
-        # Collect voting data
+        # Collect arguments and voting data per agent in a single traversal
+        argument_counts: Dict[str, int] = defaultdict(int)
+        total_lengths: Dict[str, int] = defaultdict(int)
         first_place_counts: Dict[str, int] = defaultdict(int)
         total_vote_counts: Dict[str, int] = defaultdict(int)
 
         for iteration in state.iterations:
+            for arg in iteration.arguments:
+                argument_counts[arg.author] += 1
+                total_lengths[arg.author] += len(arg.content)
+
             for vote in iteration.votes:
                 if vote.ranking:
                     # First place
@@ -143,85 +174,67 @@ class DebateAnalyzer:
                     for name in vote.ranking:
                         total_vote_counts[name] += 1
 
-        # Calculate win rate (# of first place / total participations)
-        participations = len(state.iterations)
-
-        for agent_name in agent_arguments.keys():
-            arguments = agent_arguments[agent_name]
-            first_place = first_place_counts.get(agent_name, 0)
-            win_rate = first_place / participations if participations > 0 else 0.0
-
-            avg_length = sum(len(arg.content) for arg in arguments) / len(arguments) if arguments else 0.0
-
-            stats[agent_name] = AgentStats(
-                name=agent_name,
-                total_arguments=len(arguments),
-                avg_focus_score=0.8,  # TODO: integrate with focus_scorer
-                first_place_votes=first_place,
-                total_votes_received=total_vote_counts.get(agent_name, 0),
-                win_rate=win_rate,
-                avg_argument_length=avg_length,
-                participations=participations,
-            )
-
-        return stats
+        return _build_agent_stats(
+            argument_counts=argument_counts,
+            total_lengths=total_lengths,
+            first_place_counts=first_place_counts,
+            total_vote_counts=total_vote_counts,
+            participations=len(state.iterations),
+        )
 
     def _build_voting_matrix(self, state: DebateState) -> Dict[str, Dict[str, int]]:
         """Build matrix of who voted for whom"""
-        matrix: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        weights: Counter = Counter()
 
         for iteration in state.iterations:
             for vote in iteration.votes:
-                voter = vote.voter
-                if vote.ranking:
-                    # First choice gets highest weight
-                    for idx, voted_for in enumerate(vote.ranking):
-                        weight = len(vote.ranking) - idx
-                        matrix[voter][voted_for] += weight
+                if not vote.ranking:
+                    continue
+                # First choice gets highest weight
+                num_ranked = len(vote.ranking)
+                weights.update({(vote.voter, voted_for): num_ranked - idx for idx, voted_for in enumerate(vote.ranking)})
+
+        # Pivot (voter, voted_for) -> weight into voter -> {voted_for -> weight}
+        matrix: Dict[str, Dict[str, int]] = defaultdict(dict)
+        for (voter, voted_for), weight in weights.items():
+            matrix[voter][voted_for] = weight
 
-        return {k: dict(v) for k, v in matrix.items()}
+        return dict(matrix)
 
     def _build_argument_graph(self, state: DebateState) -> Dict[str, Any]:
         """
         Build a graph showing relationships between arguments
-        Returns NetworkX-compatible JSON
+        Returns NetworkX-compatible JSON (same shape as nx.node_link_data)
         """
-        G = nx.DiGraph()
+        nodes: List[Dict[str, Any]] = []
+        links: List[Dict[str, Any]] = []
 
-        # Add nodes for each argument
-        arg_counter = 0
-        arg_id_map = {}
+        # Add nodes for each argument and connect them to the previous iteration's
+        # arguments (arguments in iteration N respond to iteration N-1)
+        prev_iteration_args: List[str] = []
 
         for iteration in state.iterations:
+            current_args: List[str] = []
             for arg in iteration.arguments:
-                arg_id = f"arg_{arg_counter}"
-                arg_id_map[arg_counter] = arg_id
-                G.add_node(
-                    arg_id,
-                    author=arg.author,
-                    iteration=arg.iteration,
-                    content=arg.content[:100] + "..." if len(arg.content) > 100 else arg.content,
+                arg_id = f"arg_{len(nodes)}"
+                nodes.append(
+                    {
+                        "author": arg.author,
+                        "iteration": arg.iteration,
+                        "content": _truncate(arg.content, 100, "..."),
+                        "id": arg_id,
+                    }
                 )
-                arg_counter += 1
-
-        # Add edges based on iteration sequence (arguments in iteration N respond to iteration N-1)
-        prev_iteration_args = []
-        for iteration in state.iterations:
-            current_args = []
-            for arg in iteration.arguments:
-                arg_id = [k for k, v in arg_id_map.items() if G.nodes[v]['author'] == arg.author and G.nodes[v]['iteration'] == arg.iteration]
-                if arg_id:
-                    current_arg_id = arg_id_map[arg_id[0]]
-                    current_args.append(current_arg_id)
-
-                    # Connect to previous iteration arguments
-                    for prev_arg_id in prev_iteration_args:
-                        G.add_edge(prev_arg_id, current_arg_id, weight=0.5)
+                current_args.append(arg_id)
 
+            links.extend(
+                {"weight": 0.5, "source": prev_arg_id, "target": arg_id}
+                for prev_arg_id in prev_iteration_args
+                for arg_id in current_args
+            )
             prev_iteration_args = current_args
 
-        # Convert to JSON-serializable format
-        return nx.node_link_data(G)
+        return {"directed": True, "multigraph": False, "graph": {}, "nodes": nodes, "links": links}
 
     def _analyze_sentiments(self, state: DebateState) -> Dict[str, float]:
         """
@@ -232,37 +245,21 @@ class DebateAnalyzer:
         if not self.client:
             return {}
 
+        pairs = [
+            (arg.author, _truncate(arg.content, 500))
+            for iteration in state.iterations
+            for arg in iteration.arguments
+        ]
+        batches = [pairs[i:i + SENTIMENT_BATCH_SIZE] for i in range(0, len(pairs), SENTIMENT_BATCH_SIZE)]
+
+        # Each batch is an independent LLM round-trip, so dispatch them concurrently
         agent_sentiments: Dict[str, List[float]] = defaultdict(list)
+        with ThreadPoolExecutor(max_workers=SENTIMENT_WORKERS) as executor:
+            batch_scores = list(executor.map(self._score_batch, batches))
 
-        for iteration in state.iterations:
-            for arg in iteration.arguments:
-                # Simple sentiment analysis via LLM
-                try:
-                    prompt = (
-                        f"Analisis sentimen/tone dari argumen berikut. "
-                        f"Berikan score -1.0 (sangat negatif/agresif) hingga 1.0 (sangat positif/konstruktif).\n\n"
-                        f"Argumen: {arg.content[:500]}\n\n"
-                        f"Jawab HANYA dengan angka, contoh: 0.75"
-                    )
-
-                    response = self.client.chat.completions.create(
-                        model="gemma3:1b",
-                        messages=[
-                            {"role": "system", "content": "You are a sentiment analyzer. Reply only with a number between -1.0 and 1.0."},
-                            {"role": "user", "content": prompt},
-                        ],
-                        temperature=0.3,
-                    )
-
-                    score_text = response.choices[0].message.content.strip()
-                    score = float(score_text)
-                    score = max(-1.0, min(1.0, score))  # Clamp
-
-                    agent_sentiments[arg.author].append(score)
-
-                except Exception as e:
-                    print(f"Sentiment analysis error: {e}")
-                    agent_sentiments[arg.author].append(0.0)
+        for batch, scores in zip(batches, batch_scores):
+            for (author, _), score in zip(batch, scores):
+                agent_sentiments[author].append(score)
 
         # Average per agent
         return {
@@ -270,6 +267,42 @@ class DebateAnalyzer:
             for agent, scores in agent_sentiments.items()
         }
 
+    def _score_batch(self, batch: List[Tuple[str, str]]) -> List[float]:
+        """
+        Score the sentiment of several arguments with a single LLM call
+
+        Returns one score per (author, content) pair, in order. The whole
+        batch falls back to 0.0 if the response cannot be parsed.
+        """
+        numbered = "\n".join(f"{i}. {content}" for i, (_, content) in enumerate(batch, 1))
+        prompt = (
+            f"Analisis sentimen/tone dari {len(batch)} argumen berikut. "
+            f"Berikan score -1.0 (sangat negatif/agresif) hingga 1.0 (sangat positif/konstruktif) untuk setiap argumen.\n\n"
+            f"{numbered}\n\n"
+            f"Jawab HANYA dengan JSON list berisi {len(batch)} angka sesuai urutan, contoh: [0.75, -0.2]"
+        )
+
+        try:
+            response = self.client.chat.completions.create(
+                model="gemma3:1b",
+                messages=[
+                    {"role": "system", "content": "You are a sentiment analyzer. Reply only with a JSON list of numbers between -1.0 and 1.0."},
+                    {"role": "user", "content": prompt},
+                ],
+                temperature=0.3,
+            )
+
+            score_text = response.choices[0].message.content.strip()
+            scores = json.loads(score_text[score_text.index("["):score_text.rindex("]") + 1])
+            if len(scores) != len(batch):
+                raise ValueError(f"expected {len(batch)} scores, got {len(scores)}")
+
+            return [max(-1.0, min(1.0, float(score))) for score in scores]  # Clamp
+
+        except Exception as e:
+            print(f"Sentiment analysis error: {e}")
+            return [0.0] * len(batch)
+
     def _calculate_consensus_progression(self, state: DebateState) -> List[float]:
         """Calculate how consensus evolved over iterations"""
         scores = []
@@ -279,16 +312,10 @@ class DebateAnalyzer:
                 scores.append(0.0)
                 continue
 
-            # Calculate consensus as concentration of first-place votes
-            first_place_counts: Dict[str, int] = defaultdict(int)
+            # Consensus = share of first-place votes held by the leading candidate
+            first_place_counts = Counter(vote.ranking[0] for vote in iteration.votes if vote.ranking)
             total_votes = len(iteration.votes)
-
-            for vote in iteration.votes:
-                if vote.ranking:
-                    first_place_counts[vote.ranking[0]] += 1
-
-            # Maximum first place percentage = consensus score
-            max_first_place = max(first_place_counts.values()) if first_place_counts else 0
+            max_first_place = first_place_counts.most_common(1)[0][1] if first_place_counts else 0
             consensus_score = max_first_place / total_votes if total_votes > 0 else 0.0
 
             scores.append(consensus_score)
@@ -297,15 +324,7 @@ class DebateAnalyzer:
 
     def load_debate_from_file(self, file_path: Path) -> DebateState:
         """Load debate state from JSON file"""
-        with open(file_path) as f:
-            data = json.load(f)
-
-        # TODO: Implement proper deserialization
-        # For now, return as-is
-        from council.types import DebateState
-        from pydantic import parse_obj_as
-
-        return parse_obj_as(DebateState, data)
+        return _DEBATE_STATE_ADAPTER.validate_python(_read_json(file_path))
 
     def aggregate_stats_across_debates(self, debate_files: List[Path]) -> Dict[str, Any]:
         """
@@ -316,18 +335,13 @@ class DebateAnalyzer:
         """
         all_agent_stats: Dict[str, List[AgentStats]] = defaultdict(list)
 
-        for file_path in debate_files:
-            try:
-                state = self.load_debate_from_file(file_path)
-                analytics = self.analyze_debate(state)
-
-                for agent_name, stats in analytics.agent_stats.items():
+        # Files are independent and parsing is CPU-bound, so spread them across processes
+        chunksize = max(1, len(debate_files) // ((os.cpu_count() or 1) * 4))
+        with ProcessPoolExecutor() as executor:
+            for agent_map in executor.map(_analyze_one, debate_files, chunksize=chunksize):
+                for agent_name, stats in agent_map.items():
                     all_agent_stats[agent_name].append(stats)
 
-            except Exception as e:
-                print(f"Error loading {file_path}: {e}")
-                continue
-
         # Aggregate
         aggregated = {}
         for agent_name, stats_list in all_agent_stats.items():
@@ -340,3 +354,96 @@ class DebateAnalyzer:
             }
 
         return aggregated
+
+
+def _truncate(text: str, limit: int, suffix: str = "") -> str:
+    """Shorten text to limit chars (plus suffix), returning short texts untouched"""
+    if len(text) <= limit:
+        return text
+    return text[:limit] + suffix
+
+
+def _read_json(file_path: Path) -> Any:
+    """Parse a JSON file from its raw bytes, skipping the intermediate str decode"""
+    with open(file_path, "rb") as f:
+        return json.loads(f.read())
+
+
+def _analyze_one(file_path: Path) -> Dict[str, AgentStats]:
+    """Load a single debate file and compute its agent stats (process pool worker)"""
+    try:
+        data = _read_json(file_path)
+
+        # Only agent stats are needed here, so skip the DebateState
+        # round-trip and the LLM-backed parts of analyze_debate
+        return agent_stats_from_dict(data)
+
+    except Exception as e:
+        print(f"Error loading {file_path}: {e}")
+        return {}
+
+
+def agent_stats_from_dict(data: Dict[str, Any]) -> Dict[str, AgentStats]:
+    """
+    Calculate per-agent statistics directly from a serialized DebateState
+
+    Produces the same result as DebateAnalyzer._calculate_agent_stats without
+    validating the data into pydantic models first.
+    """
+    iterations = data.get("iterations", [])
+
+    argument_counts: Dict[str, int] = defaultdict(int)
+    total_lengths: Dict[str, int] = defaultdict(int)
+    first_place_counts: Dict[str, int] = defaultdict(int)
+    total_vote_counts: Dict[str, int] = defaultdict(int)
+
+    for iteration in iterations:
+        for arg in iteration.get("arguments", []):
+            author = arg["author"]
+            argument_counts[author] += 1
+            total_lengths[author] += len(arg["content"])
+
+        for vote in iteration.get("votes", []):
+            ranking = vote.get("ranking")
+            if ranking:
+                first_place_counts[ranking[0]] += 1
+                for name in ranking:
+                    total_vote_counts[name] += 1
+
+    return _build_agent_stats(
+        argument_counts=argument_counts,
+        total_lengths=total_lengths,
+        first_place_counts=first_place_counts,
+        total_vote_counts=total_vote_counts,
+        participations=len(iterations),
+    )
+
+
+def _build_agent_stats(
+    argument_counts: Dict[str, int],
+    total_lengths: Dict[str, int],
+    first_place_counts: Dict[str, int],
+    total_vote_counts: Dict[str, int],
+    participations: int,
+) -> Dict[str, AgentStats]:
+    """Turn accumulated per-agent counters into AgentStats"""
+    stats = {}
+
+    for agent_name, count in argument_counts.items():
+        first_place = first_place_counts.get(agent_name, 0)
+        # Win rate = # of first place / total participations
+        win_rate = first_place / participations if participations > 0 else 0.0
+        avg_length = total_lengths.get(agent_name, 0) / count if count else 0.0
+
+        stats[agent_name] = AgentStats(
+            name=agent_name,
+            total_arguments=count,
+            avg_focus_score=0.8,  # TODO: integrate with focus_scorer
+            first_place_votes=first_place,
+            total_votes_received=total_vote_counts.get(agent_name, 0),
+            win_rate=win_rate,
+            avg_argument_length=avg_length,
+            participations=participations,
+        )
+
+    return stats
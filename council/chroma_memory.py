@@ -1,20 +1,34 @@
 from __future__ import annotations
 
 import json
+import time
+from collections import deque
 from dataclasses import dataclass, asdict
-from datetime import datetime
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 
-import chromadb
-from chromadb.config import Settings
+import numpy as np
 from langfuse.openai import OpenAI
 
+from .embed_cache import embed_text_cached
+
 EMBED_MODEL = "granite-embedding:latest"
 
+# Time windows tried (smallest first) when fetching the most recent episodes
+RECENT_WINDOWS_SECONDS = (86400, 7 * 86400, 30 * 86400, 365 * 86400)
+# Most episodes the final, unfiltered-by-time pass of fetch_recent scans
+RECENT_FALLBACK_SCAN_LIMIT = 500
+# Newest episodes kept in memory so unfiltered fetch_recent needs no ChromaDB read
+RECENT_BUFFER_SIZE = 64
+# Largest collection whose embeddings are mirrored in RAM for in-process similarity search
+INMEMORY_MAX_EPISODES = 50_000
+
 
 @dataclass
 class MemoryRecord:
+    __slots__ = ("id", "timestamp", "question", "agent", "role", "phase", "content", "metadata")
+
     id: str
     timestamp: datetime
     question: str
@@ -33,16 +47,45 @@ class MemoryRecord:
     def from_chroma(cls, doc_id: str, document: str, metadata: Dict[str, Any]) -> "MemoryRecord":
         return cls(
             id=doc_id,
-            timestamp=datetime.fromisoformat(metadata['timestamp']),
+            timestamp=metadata_timestamp(metadata),
             question=metadata['question'],
             agent=metadata['agent'],
             role=metadata['role'],
             phase=metadata['phase'],
             content=document,
-            metadata={k: v for k, v in metadata.items() if k not in ['timestamp', 'question', 'agent', 'role', 'phase']}
+            metadata={k: v for k, v in metadata.items() if k not in ['timestamp', 'ts', 'question', 'agent', 'role', 'phase']}
         )
 
 
+def metadata_timestamp(metadata: Dict[str, Any]) -> datetime:
+    """Naive UTC timestamp of a stored episode, preferring the numeric 'ts' field"""
+    ts = metadata.get('ts')
+    if ts is not None:
+        return utc_from_timestamp(ts)
+    # Episodes recorded before 'ts' was stored only have the ISO string
+    return datetime.fromisoformat(metadata['timestamp'])
+
+
+def utc_from_timestamp(ts: float) -> datetime:
+    return datetime.fromtimestamp(ts, timezone.utc).replace(tzinfo=None)
+
+
+def _combine_where(clauses: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Build a ChromaDB where filter from single-field clauses"""
+    if not clauses:
+        return None
+    if len(clauses) == 1:
+        return clauses[0]
+    return {"$and": clauses}
+
+
+def _metadata_sort_key(metadata: Dict[str, Any]) -> float:
+    ts = metadata.get('ts')
+    if ts is not None:
+        return ts
+    return metadata_timestamp(metadata).replace(tzinfo=timezone.utc).timestamp()
+
+
 class ChromaCouncilMemory:
     """
     Advanced vector memory system using ChromaDB with semantic search capabilities.
@@ -54,6 +97,10 @@ class ChromaCouncilMemory:
         collection_name: str = "council_memory",
         persist_directory: Path = Path("memory/chroma_db"),
     ) -> None:
+        # Imported here so modules that only need embed_text don't load ChromaDB
+        import chromadb
+        from chromadb.config import Settings
+
         persist_directory.mkdir(parents=True, exist_ok=True)
 
         # Initialize ChromaDB with persistence
@@ -72,10 +119,147 @@ class ChromaCouncilMemory:
         )
 
         self._doc_counter = 0
+        self._verdict_collection_name = f"{collection_name}_verdicts"
+        self._verdicts = None  # Created on first use
+        # Oldest -> newest; loaded from ChromaDB on first unfiltered fetch_recent
+        self._recent: deque = deque(maxlen=RECENT_BUFFER_SIZE)
+        self._recent_loaded = False
+        self._pending: List[Dict[str, Any]] = []  # Episodes waiting for flush()
+        # In-process copy of the collection for fetch_similar_fast: one contiguous
+        # (N, D) float32 matrix plus row norms; loaded on first use
+        self._matrix: Optional[np.ndarray] = None
+        self._norms: Optional[np.ndarray] = None
+        self._ids: List[str] = []
+        self._documents: List[str] = []
+        self._metadatas: List[Dict[str, Any]] = []
+        self._matrix_loaded = False
+
+    def _remember_added(
+        self,
+        ids: List[str],
+        embeddings: List[List[float]],
+        documents: List[str],
+        metadatas: List[Dict[str, Any]],
+    ) -> None:
+        """Track newly stored episodes in the recent buffer and the in-process matrix"""
+        for doc_id, document, metadata in zip(ids, documents, metadatas):
+            self._recent.append(MemoryRecord.from_chroma(doc_id=doc_id, document=document, metadata=metadata))
+        if self._matrix_loaded:
+            self._append_matrix(ids, embeddings, documents, metadatas)
+
+    def _append_matrix(
+        self,
+        ids: List[str],
+        embeddings: Any,
+        documents: List[str],
+        metadatas: List[Dict[str, Any]],
+    ) -> None:
+        if not ids:
+            return
+        rows = np.asarray(embeddings, dtype=np.float32)
+        if self._matrix is not None and self._matrix.shape[1] != rows.shape[1]:
+            # Embedding model changed; mixed dimensions can't share a matrix
+            self._reset_matrix()
+            return
+        norms = np.linalg.norm(rows, axis=1)
+        if self._matrix is None:
+            self._matrix, self._norms = rows, norms
+        else:
+            self._matrix = np.vstack((self._matrix, rows))
+            self._norms = np.concatenate((self._norms, norms))
+        self._ids.extend(ids)
+        self._documents.extend(documents)
+        self._metadatas.extend(metadatas)
+        if len(self._ids) > INMEMORY_MAX_EPISODES:
+            self._reset_matrix()
+
+    def _reset_matrix(self) -> None:
+        """Drop the in-process matrix; fetch_similar_fast reloads it if the collection is small enough"""
+        self._matrix = None
+        self._norms = None
+        self._ids, self._documents, self._metadatas = [], [], []
+        self._matrix_loaded = False
+
+    def _load_matrix(self) -> bool:
+        """Load all embeddings into the in-process matrix. Returns False if it can't be used."""
+        if self._matrix_loaded:
+            return True
+        try:
+            if self.collection.count() > INMEMORY_MAX_EPISODES:
+                return False
+            data = self.collection.get(include=["embeddings", "documents", "metadatas"])
+        except Exception:
+            return False
+        self._matrix_loaded = True
+        self._append_matrix(data['ids'], data['embeddings'], data['documents'], data['metadatas'])
+        return self._matrix_loaded
+
+    def _verdict_collection(self):
+        if self._verdicts is None:
+            self._verdicts = self.client.get_or_create_collection(
+                name=self._verdict_collection_name,
+                metadata={"hnsw:space": "cosine"},
+            )
+        return self._verdicts
+
+    def get_cached_verdict(self, prompt_embedding: List[float], threshold: float = 0.92) -> Optional[str]:
+        """
+        Look up a stored LLM verdict for a semantically near-identical prompt.
+
+        Args:
+            prompt_embedding: Embedding of the evaluation prompt
+            threshold: Minimum cosine similarity for a hit
+
+        Returns:
+            Cached verdict text, or None on a miss
+        """
+        try:
+            results = self._verdict_collection().query(query_embeddings=[prompt_embedding], n_results=1)
+        except Exception:
+            return None
+
+        if not results['ids'] or not results['ids'][0]:
+            return None
+        if 1.0 - results['distances'][0][0] < threshold:
+            return None
+        return results['documents'][0][0]
+
+    def store_verdict(self, prompt_embedding: List[float], verdict: str) -> None:
+        """Store an LLM verdict keyed by its prompt embedding"""
+        self._doc_counter += 1
+        self._verdict_collection().add(
+            ids=[f"verdict_{time.time()}_{self._doc_counter}"],
+            embeddings=[prompt_embedding],
+            documents=[verdict],
+            metadatas=[{"ts": time.time()}],
+        )
 
     def close(self) -> None:
-        """Close connection (ChromaDB auto-persists)"""
-        pass
+        """Store queued episodes (ChromaDB auto-persists)"""
+        self.flush()
+
+    def queue_episode(self, **episode: Any) -> None:
+        """
+        Queue an episode for the next flush() instead of inserting it right away.
+
+        Accepts the keyword arguments of record_episode.
+        """
+        self._pending.append(episode)
+
+    def flush(self, client: Optional[OpenAI] = None) -> List[str]:
+        """
+        Store all queued episodes with a single ChromaDB insert.
+
+        Args:
+            client: OpenAI client used to embed queued episodes that have no embedding
+
+        Returns:
+            Document IDs of the stored episodes
+        """
+        if not self._pending:
+            return []
+        pending, self._pending = self._pending, []
+        return self.record_episodes(pending, client=client)
 
     def record_episode(
         self,
@@ -106,13 +290,95 @@ class ChromaCouncilMemory:
         if embedding is None:
             raise ValueError("Embedding is required for ChromaDB storage")
 
-        # Generate unique ID
-        doc_id = f"{role}_{phase}_{datetime.utcnow().timestamp()}_{self._doc_counter}"
+        doc_id, metadata = self._prepare_episode(
+            question=question,
+            agent=agent,
+            role=role,
+            phase=phase,
+            extra_metadata=extra_metadata,
+        )
+
+        # Add to ChromaDB
+        self.collection.add(
+            ids=[doc_id],
+            embeddings=[embedding],
+            documents=[content],
+            metadatas=[metadata],
+        )
+        self._remember_added([doc_id], [embedding], [content], [metadata])
+
+        return doc_id
+
+    def record_episodes(
+        self,
+        records: List[Dict[str, Any]],
+        client: Optional[OpenAI] = None,
+    ) -> List[str]:
+        """
+        Record several episodes with a single ChromaDB insert.
+
+        Args:
+            records: Dicts with the keyword arguments accepted by record_episode
+                (question, agent, role, phase, content, optional embedding and
+                extra_metadata)
+            client: OpenAI client used to embed records that have no embedding,
+                all in one request
+
+        Returns:
+            Document IDs, in the same order as records
+        """
+        if not records:
+            return []
+
+        embeddings = [record.get("embedding") for record in records]
+        missing = [i for i, emb in enumerate(embeddings) if emb is None]
+        if missing:
+            if client is None:
+                raise ValueError("Embedding is required for ChromaDB storage")
+            for i, emb in zip(missing, embed_texts(client, [records[i]["content"] for i in missing])):
+                embeddings[i] = emb
+
+        ids: List[str] = []
+        metadatas: List[Dict[str, Any]] = []
+        for record in records:
+            doc_id, metadata = self._prepare_episode(
+                question=record["question"],
+                agent=record["agent"],
+                role=record["role"],
+                phase=record["phase"],
+                extra_metadata=record.get("extra_metadata"),
+            )
+            ids.append(doc_id)
+            metadatas.append(metadata)
+
+        documents = [record["content"] for record in records]
+        self.collection.add(
+            ids=ids,
+            embeddings=embeddings,
+            documents=documents,
+            metadatas=metadatas,
+        )
+        self._remember_added(ids, embeddings, documents, metadatas)
+
+        return ids
+
+    def _prepare_episode(
+        self,
+        *,
+        question: str,
+        agent: str,
+        role: str,
+        phase: str,
+        extra_metadata: Optional[Dict[str, Any]] = None,
+    ) -> Tuple[str, Dict[str, Any]]:
+        """Generate a unique document ID and the metadata for an episode"""
+        ts = time.time()
+        doc_id = f"{role}_{phase}_{ts}_{self._doc_counter}"
         self._doc_counter += 1
 
-        # Prepare metadata
         metadata = {
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": utc_from_timestamp(ts).isoformat(),
+            "ts": ts,
             "question": question,
             "agent": agent,
             "role": role,
@@ -122,15 +388,7 @@ class ChromaCouncilMemory:
         if extra_metadata:
             metadata.update(extra_metadata)
 
-        # Add to ChromaDB
-        self.collection.add(
-            ids=[doc_id],
-            embeddings=[embedding],
-            documents=[content],
-            metadatas=[metadata],
-        )
-
-        return doc_id
+        return doc_id, metadata
 
     def fetch_recent(
         self,
@@ -142,43 +400,117 @@ class ChromaCouncilMemory:
         """
         Fetch recent episodes, optionally filtered by question/role/phase.
 
-        Note: ChromaDB doesn't have native sorting by timestamp, so we fetch more
-        and sort in memory.
+        Unfiltered requests are served from an in-memory buffer of the newest
+        episodes (loaded from ChromaDB once). Otherwise ChromaDB prunes by the
+        numeric 'ts' metadata over a widening time window, since it has no native
+        sorting by timestamp, and the survivors are sorted in memory.
         """
-        where_filter = {}
+        if not (question or role or phase) and limit <= RECENT_BUFFER_SIZE:
+            if not self._recent_loaded:
+                self._recent.clear()
+                self._recent.extend(reversed(self._query_recent(RECENT_BUFFER_SIZE, [])))
+                self._recent_loaded = True
+            return list(reversed(self._recent))[:limit]
+
+        filters: List[Dict[str, Any]] = []
         if question:
-            where_filter["question"] = question
+            filters.append({"question": question})
         if role:
-            where_filter["role"] = role
+            filters.append({"role": role})
         if phase:
-            where_filter["phase"] = phase
+            filters.append({"phase": phase})
+        return self._query_recent(limit, filters)
 
+    def _query_recent(self, limit: int, filters: List[Dict[str, Any]]) -> List[MemoryRecord]:
+        """Newest episodes matching filters, read from ChromaDB"""
+        now = time.time()
         try:
-            results = self.collection.get(
-                where=where_filter if where_filter else None,
-                limit=limit * 3,  # Fetch more to sort
-            )
+            # Probe with metadata only; the final pass (no time window) also picks up
+            # episodes stored without 'ts' and is capped so it never reads the whole store
+            for window in (*RECENT_WINDOWS_SECONDS, None):
+                clauses = filters + ([{"ts": {"$gte": now - window}}] if window else [])
+                probe = self.collection.get(
+                    where=_combine_where(clauses),
+                    include=["metadatas"],
+                    limit=None if window else max(limit, RECENT_FALLBACK_SCAN_LIMIT),
+                )
+                if len(probe['ids']) >= limit:
+                    break
         except Exception:
             # If collection is empty
             return []
 
-        if not results['ids']:
+        if not probe['ids']:
             return []
 
-        # Convert to MemoryRecords
-        records = []
-        for i in range(len(results['ids'])):
-            record = MemoryRecord.from_chroma(
-                doc_id=results['ids'][i],
-                document=results['documents'][i],
-                metadata=results['metadatas'][i],
+        # Pick the newest ids from the raw metadata, then load documents only for those
+        metadatas = probe['metadatas']
+        indices = sorted(
+            range(len(probe['ids'])),
+            key=lambda i: _metadata_sort_key(metadatas[i]),
+            reverse=True,
+        )[:limit]
+        top_ids = [probe['ids'][i] for i in indices]
+
+        try:
+            results = self.collection.get(ids=top_ids, include=["documents"])
+        except Exception:
+            return []
+        documents = dict(zip(results['ids'], results['documents']))
+
+        return [
+            MemoryRecord.from_chroma(
+                doc_id=probe['ids'][i],
+                document=documents.get(probe['ids'][i], ""),
+                metadata=metadatas[i],
             )
-            records.append(record)
+            for i in indices
+        ]
 
-        # Sort by timestamp descending
-        records.sort(key=lambda r: r.timestamp, reverse=True)
+    def fetch_similar_fast(
+        self,
+        query_embedding: List[float],
+        limit: int = 3,
+        min_similarity: float = 0.5,
+    ) -> List[tuple[float, MemoryRecord]]:
+        """
+        Cosine similarity search over the in-process embedding matrix.
 
-        return records[:limit]
+        Scores every episode with one float32 matrix-vector product and picks the
+        top results with argpartition. Falls back to fetch_similar (ChromaDB's
+        index) when the collection is larger than INMEMORY_MAX_EPISODES.
+
+        Args:
+            query_embedding: Query vector
+            limit: Max number of results
+            min_similarity: Minimum cosine similarity threshold (0-1)
+
+        Returns:
+            List of (similarity_score, MemoryRecord) tuples, sorted by relevance
+        """
+        if not self._load_matrix():
+            return self.fetch_similar(query_embedding, limit=limit, min_similarity=min_similarity)
+        if self._matrix is None or limit <= 0:
+            return []
+
+        q = np.asarray(query_embedding, dtype=np.float32)
+        if q.shape[0] != self._matrix.shape[1]:
+            return self.fetch_similar(query_embedding, limit=limit, min_similarity=min_similarity)
+        denom = self._norms * np.linalg.norm(q)
+        scores = np.divide(self._matrix @ q, denom, out=np.zeros_like(denom), where=denom > 0)
+
+        k = min(limit, scores.shape[0])
+        top = np.argpartition(scores, -k)[-k:]
+        top = top[np.argsort(scores[top])[::-1]]
+
+        return [
+            (
+                float(scores[i]),
+                MemoryRecord.from_chroma(doc_id=self._ids[i], document=self._documents[i], metadata=self._metadatas[i]),
+            )
+            for i in top
+            if scores[i] >= min_similarity
+        ]
 
     def fetch_similar(
         self,
@@ -278,12 +610,22 @@ class ChromaCouncilMemory:
             name=self.collection.name,
             metadata={"hnsw:space": "cosine"},
         )
+        self._recent.clear()
+        self._recent_loaded = False
+        self._reset_matrix()
 
 
 def embed_text(client: OpenAI, text: str) -> List[float]:
-    """Generate embedding for text using Ollama embedding model"""
-    resp = client.embeddings.create(model=EMBED_MODEL, input=[text])
-    return resp.data[0].embedding
+    """Generate embedding for text using Ollama embedding model (cached, see embed_cache)"""
+    return embed_text_cached(client, text, EMBED_MODEL)
+
+
+def embed_texts(client: OpenAI, texts: List[str]) -> List[List[float]]:
+    """Generate embeddings for several texts with a single request"""
+    if not texts:
+        return []
+    resp = client.embeddings.create(model=EMBED_MODEL, input=texts)
+    return [d.embedding for d in resp.data]
 
 
 def summarize_memory(
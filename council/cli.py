@@ -2,24 +2,29 @@ from __future__ import annotations
 
 import os
 from typing import Optional, List, Literal
-from dotenv import load_dotenv
 import typer
 from rich.console import Console
-from .types import DebateConfig
-from .personalities import default_personalities
-from .engine import run_debate
-from .storage import autosave_json
-from .interactive import run_interactive
-from .consciousness import run_council_of_consciousness, CouncilConfig
-from .rag_system import RAGSystem, RAGConfig
-from .enhanced_memory import EnhancedCouncilMemory
-from .clients import get_ollama_client
+
+# Command-specific modules (engine, ChromaDB memory, OpenAI/Langfuse clients, ...)
+# are imported inside each command so `--help` and dispatch stay fast.
 
 app = typer.Typer(add_completion=False)
 console = Console()
 
 
-@app.command("debate")
+@app.callback()
+def _load_env() -> None:
+    # Runs once per process before any command (its docstring would become the app help)
+    from dotenv import load_dotenv
+
+    load_dotenv(override=False)
+    # Ensure Langfuse env present; if missing, user gets clearer error from main example
+    for var in ("LANGFUSE_PUBLIC_KEY", "LANGFUSE_SECRET_KEY"):
+        if not os.getenv(var):
+            console.print(f"[yellow]Peringatan: {var} belum di-set. Tracing Langfuse mungkin tidak aktif.[/yellow]")
+
+
+@app.command("debate", rich_help_panel="Debat")
 def debate(
     question: List[str] = typer.Argument(..., help="Pertanyaan/topik untuk didebatkan"),
     title: Optional[str] = typer.Option(None, "--title", help="Judul debat (optional)"),
@@ -35,13 +40,26 @@ def debate(
         False, "--eliminate/--no-eliminate", help="Aktifkan eliminasi agen per iterasi (opsional)"
     ),
     rag: bool = typer.Option(
-        False, "--rag/--no-rag", help="Aktifkan RAG (Retrieval Augmented Generation)"
+        False, "--rag/--no-rag", help="Aktifkan RAG (Retrieval Augmented Generation)", rich_help_panel="RAG"
     ),
     rag_use_memory: bool = typer.Option(
-        True, "--rag-memory/--no-rag-memory", help="Gunakan debate memory (ChromaDB) untuk RAG"
+        True, "--rag-memory/--no-rag-memory", help="Gunakan debate memory (ChromaDB) untuk RAG", rich_help_panel="RAG"
     ),
     rag_use_docs: bool = typer.Option(
-        False, "--rag-docs/--no-rag-docs", help="Gunakan external documents untuk RAG"
+        False, "--rag-docs/--no-rag-docs", help="Gunakan external documents untuk RAG", rich_help_panel="RAG"
+    ),
+    concurrency: int = typer.Option(
+        8,
+        "--concurrency",
+        envvar="COUNCIL_MAX_CONCURRENCY",
+        rich_help_panel="Performa",
+        help="Maksimal request LLM paralel (turunkan bila Ollama kewalahan)",
+    ),
+    batched_voting: bool = typer.Option(
+        False,
+        "--batched-votes/--no-batched-votes",
+        rich_help_panel="Performa",
+        help="Satu panggilan model hakim memberi peringkat untuk semua pemilih (lebih cepat, kurang independen)",
     ),
 ):
     """
@@ -54,23 +72,19 @@ def debate(
     - Gunakan --rag-memory untuk menggunakan ChromaDB memory
     - Gunakan --rag-docs untuk menggunakan external documents dari folder 'docs/'
     """
-    load_dotenv(override=False)
-    # Ensure Langfuse env present; if missing, user gets clearer error from main example
-    for var in ("LANGFUSE_PUBLIC_KEY", "LANGFUSE_SECRET_KEY"):
-        if not os.getenv(var):
-            console.print(f"[yellow]Peringatan: {var} belum di-set. Tracing Langfuse mungkin tidak aktif.[/yellow]")
-
     qtext = " ".join(question).strip()
     if not qtext:
         console.print("[red]Pertanyaan kosong.[/red]")
         raise typer.Exit(code=2)
 
-    if consensus == "majority":
-        threshold = 0.5
-    elif consensus == "supermajority":
-        threshold = 2.0 / 3.0
-    else:
-        threshold = 1.0
+    from .types import CONSENSUS_THRESHOLDS, DebateConfig
+    from .personalities import default_personalities
+    from .clients import run_async, set_concurrency
+    from .engine import run_debate_async
+    from .storage import autosave_json
+
+    # Process-wide limit (also sizes the connection pools); set once before any client exists
+    set_concurrency(concurrency)
 
     config = DebateConfig(
         title=title,
@@ -78,7 +92,9 @@ def debate(
         judge_model=judge_model,
         min_iterations=min_iterations,
         max_iterations=max_iterations,
-        consensus_threshold=threshold,
+        consensus_threshold=CONSENSUS_THRESHOLDS[consensus],
+        max_concurrency=concurrency,
+        batched_voting=batched_voting,
     )
     personas = default_personalities()
 
@@ -86,63 +102,71 @@ def debate(
     rag_system = None
     if rag:
         from pathlib import Path
+        from .clients import get_ollama_client
+        from .rag_system import create_rag_system
 
-        client = get_ollama_client()
-        memory = EnhancedCouncilMemory() if rag_use_memory else None
-
-        rag_config = RAGConfig(
-            enabled=True,
+        rag_system = create_rag_system(
             use_memory=rag_use_memory,
-            use_external_docs=rag_use_docs,
             external_docs_path=Path("docs") if rag_use_docs else None,
-            retrieval_limit=3,
-            min_similarity=0.6,
+            client=get_ollama_client(),
         )
 
-        rag_system = RAGSystem(rag_config, memory, client)
-
-        # Load external docs if enabled
-        if rag_use_docs:
-            docs_path = Path("docs")
-            if docs_path.exists():
-                rag_system.load_external_documents(docs_path)
-            else:
-                console.print("[yellow]Warning: docs/ folder tidak ditemukan untuk RAG documents[/yellow]")
-
         console.print("[cyan]🧠 RAG System Enabled[/cyan]")
         stats = rag_system.get_rag_stats()
         console.print(f"[dim]  - Memory: {stats['memory_enabled']}, External Docs: {stats['external_docs_count']}[/dim]")
 
-    run_debate(config=config, personalities=personas, save_callback=autosave_json, elimination=elimination, rag_system=rag_system)
+    # Checkpoints are written off the event loop by the engine
+    run_async(
+        run_debate_async(
+            config=config,
+            personalities=personas,
+            save_callback=autosave_json,
+            elimination=elimination,
+            rag_system=rag_system,
+        )
+    )
 
 
-@app.command("interactive")
+@app.command("interactive", rich_help_panel="Debat")
 def interactive():
     """
     Wizard interaktif di terminal dengan pilihan agen, konsensus, eliminasi,
     dan log proses dalam Markdown secara realtime.
     """
+    from .interactive import run_interactive
+
     run_interactive()
 
 
-@app.command("consciousness")
+@app.command("consciousness", rich_help_panel="Debat")
 def consciousness(
     question: Optional[str] = typer.Option(None, "--question", help="Pertanyaan/topik"),
     title: Optional[str] = typer.Option(None, "--title", help="Judul debat (opsional)"),
     elimination: bool = typer.Option(False, "--eliminate/--no-eliminate", help="Eliminasi refleksi"),
+    concurrency: int = typer.Option(
+        8,
+        "--concurrency",
+        envvar="COUNCIL_MAX_CONCURRENCY",
+        rich_help_panel="Performa",
+        help="Maksimal request LLM paralel (turunkan bila Ollama kewalahan)",
+    ),
 ):
     """
     Jalankan Council of Consciousness: moderator, filosof, humanis, kritikus, spiritualis, teknokrat.
     Berjalan dengan memori episodik & log Markdown otomatis.
     """
-    load_dotenv(override=False)
+    from .consciousness import run_council_of_consciousness, CouncilConfig
+    from .clients import set_concurrency
+
+    set_concurrency(concurrency)
+
     if not question:
         question = typer.prompt("Pertanyaan/Topik")
     config = CouncilConfig(question=question, title=title, elimination=elimination)
     run_council_of_consciousness(config)
 
 
-@app.command("web")
+@app.command("web", rich_help_panel="Server")
 def web_dashboard(
     host: str = typer.Option("0.0.0.0", "--host", help="Host address"),
     port: int = typer.Option(8000, "--port", help="Port number"),
@@ -1,6 +1,35 @@
+import asyncio
+import importlib.util
 import os
+import random
+from functools import lru_cache
+from typing import Any, AsyncIterator, Awaitable, Optional, Tuple, TypeVar
+import httpx
+import openai
 from dotenv import load_dotenv
-from langfuse.openai import OpenAI
+from langfuse.openai import AsyncOpenAI, OpenAI
+
+# Errors worth retrying: provider throttling, dropped connections/timeouts, 5xx
+_RETRYABLE_ERRORS = (
+    openai.RateLimitError,
+    openai.APIConnectionError,
+    openai.InternalServerError,
+)
+_MAX_ATTEMPTS = 4
+_BACKOFF_BASE = 0.5
+_BACKOFF_MAX = 10.0
+
+# Minimum pool sizing for both clients; HTTP/2 (multiplexed streams over one
+# connection) only when the optional h2 package is installed
+_MIN_CONNECTIONS = 32
+_MIN_KEEPALIVE = 16
+_HTTP2 = importlib.util.find_spec("h2") is not None
+
+_max_concurrency = int(os.getenv("COUNCIL_MAX_CONCURRENCY", "8"))
+_semaphore: Optional[Tuple[asyncio.AbstractEventLoop, asyncio.Semaphore]] = None
+_async_client: Optional[Tuple[asyncio.AbstractEventLoop, AsyncOpenAI]] = None
+
+T = TypeVar("T")
 
 
 def _ensure_langfuse_env() -> None:
@@ -11,11 +40,153 @@ def _ensure_langfuse_env() -> None:
         raise RuntimeError(f"Missing Langfuse environment variables: {names}. Set them in your .env.")
 
 
-def get_ollama_client() -> OpenAI:
+def _pool_limits(bounded: bool = True) -> httpx.Limits:
+    # At least one keep-alive connection per allowed in-flight request, so concurrent
+    # agents never have to open (and handshake) a fresh connection. The async pool is
+    # unbounded: the semaphore already caps in-flight requests, so raising the limit
+    # later never needs a bigger pool (or a rebuilt client).
+    return httpx.Limits(
+        max_connections=max(_MIN_CONNECTIONS, _max_concurrency) if bounded else None,
+        max_keepalive_connections=max(_MIN_KEEPALIVE, _max_concurrency),
+    )
+
+
+def _client_kwargs() -> dict:
     load_dotenv(override=False)
     _ensure_langfuse_env()
     # Ensure Langfuse keys exist (validation done in main entrypoints typically)
     base_url = os.getenv("OLLAMA_OPENAI_BASE_URL", "http://localhost:11434/v1")
-    return OpenAI(base_url=base_url, api_key=os.getenv("OPENAI_API_KEY", "ollama"))
+    return {"base_url": base_url, "api_key": os.getenv("OPENAI_API_KEY", "ollama")}
+
+
+@lru_cache(maxsize=1)
+def get_ollama_client() -> OpenAI:
+    # One client per process so its connection pool is reused across turns and
+    # by every embedding and chat call
+    http_client = httpx.Client(limits=_pool_limits(), http2=_HTTP2)
+    return OpenAI(**_client_kwargs(), http_client=http_client)
+
+
+def get_async_ollama_client() -> AsyncOpenAI:
+    """
+    Shared async client for the running event loop.
+
+    Pooled connections are bound to the loop that opened them, so a new client is
+    created when called from a different loop. Entry points should run their loop
+    through run_async so the client is closed before the loop ends.
+    """
+    global _async_client
+    loop = asyncio.get_running_loop()
+    if _async_client is not None and _async_client[0] is loop:
+        return _async_client[1]
+
+    # Explicit pool so concurrent agent requests share keep-alive connections
+    http_client = httpx.AsyncClient(
+        limits=_pool_limits(bounded=False),
+        timeout=httpx.Timeout(180.0, connect=10.0),
+        http2=_HTTP2,
+    )
+    client = AsyncOpenAI(
+        **_client_kwargs(),
+        timeout=httpx.Timeout(180.0, connect=10.0),
+        max_retries=0,  # retries are handled by chat_with_limit
+        http_client=http_client,
+    )
+    _async_client = (loop, client)
+    return client
+
+
+async def close_async_ollama_client() -> None:
+    """Close the running loop's shared async client and its connection pool"""
+    global _async_client
+    if _async_client is not None and _async_client[0] is asyncio.get_running_loop():
+        client = _async_client[1]
+        _async_client = None
+        await client.close()
+
+
+def run_async(main: Awaitable[T]) -> T:
+    """
+    asyncio.run for CLI entry points: closes the shared async client before the
+    loop ends, so repeated runs (e.g. the interactive wizard) don't leak pools.
+    """
+
+    async def _run() -> T:
+        try:
+            return await main
+        finally:
+            await close_async_ollama_client()
+
+    return asyncio.run(_run())
+
+
+def set_concurrency(n: int) -> None:
+    """Set the maximum number of in-flight async chat requests"""
+    global _max_concurrency, _semaphore
+    _max_concurrency = max(1, n)
+    _semaphore = None
+
+
+def _get_semaphore() -> asyncio.Semaphore:
+    # A semaphore belongs to one event loop; rebuild it when the loop changes
+    global _semaphore
+    loop = asyncio.get_running_loop()
+    if _semaphore is None or _semaphore[0] is not loop:
+        _semaphore = (loop, asyncio.Semaphore(_max_concurrency))
+    return _semaphore[1]
+
+
+async def _create_with_retry(client: AsyncOpenAI, **kwargs: Any) -> Any:
+    for attempt in range(1, _MAX_ATTEMPTS + 1):
+        try:
+            return await client.chat.completions.create(**kwargs)
+        except _RETRYABLE_ERRORS:
+            if attempt == _MAX_ATTEMPTS:
+                raise
+            delay = min(_BACKOFF_MAX, _BACKOFF_BASE * 2 ** (attempt - 1))
+            await asyncio.sleep(delay + random.uniform(0, delay / 2))
+
+
+async def chat_with_limit(
+    client: AsyncOpenAI, limiter: Optional[asyncio.Semaphore] = None, **kwargs: Any
+) -> Any:
+    """
+    Create a chat completion under the concurrency limit, retrying transient errors
+    with exponential backoff.
+
+    Args:
+        client: Async client (see get_async_ollama_client)
+        limiter: Caller-owned semaphore (e.g. one per debate); defaults to the
+            process-wide limit from set_concurrency
+        **kwargs: Arguments for client.chat.completions.create
+
+    Returns:
+        The completion
+    """
+    async with limiter or _get_semaphore():
+        return await _create_with_retry(client, **kwargs)
+
+
+async def stream_with_limit(
+    client: AsyncOpenAI, limiter: Optional[asyncio.Semaphore] = None, **kwargs: Any
+) -> AsyncIterator[Any]:
+    """
+    Stream chat completion events, holding a concurrency slot until the stream ends.
+    Opening the stream is retried like chat_with_limit.
 
+    Args:
+        client: Async client (see get_async_ollama_client)
+        limiter: Caller-owned semaphore; defaults to the process-wide limit
+        **kwargs: Arguments for client.chat.completions.create (stream is forced on)
 
+    Yields:
+        Stream events
+    """
+    async with limiter or _get_semaphore():
+        stream = await _create_with_retry(client, **kwargs, stream=True)
+        try:
+            async for event in stream:
+                yield event
+        finally:
+            # Closing the response lets Ollama stop generating when the caller stops early
+            await stream.close()
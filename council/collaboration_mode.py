@@ -1,7 +1,11 @@
 from __future__ import annotations
 
+import json
+import sys
+from collections import Counter, defaultdict
 from dataclasses import dataclass, field
-from typing import List, Dict, Optional, Set
+from functools import lru_cache
+from typing import Any, List, Dict, Optional, Tuple, FrozenSet
 from enum import Enum
 
 from .types import Personality
@@ -15,7 +19,56 @@ class CollaborationStrategy(Enum):
     BRAINSTORMING = "brainstorming"  # Generate ideas collaboratively
 
 
-@dataclass
+_STRATEGY_GUIDANCE: Dict[CollaborationStrategy, str] = {
+    CollaborationStrategy.CONSENSUS_BUILDING: (
+        "Prioritas: Build consensus. Identify agreements, "
+        "address disagreements dengan dialog konstruktif."
+    ),
+    CollaborationStrategy.PROBLEM_SOLVING: (
+        "Prioritas: Solve problem together. Break down problem, "
+        "contribute expertise, integrate solutions."
+    ),
+    CollaborationStrategy.SYNTHESIS: (
+        "Prioritas: Synthesize viewpoints. Find complementary "
+        "aspects, create holistic perspective."
+    ),
+    CollaborationStrategy.BRAINSTORMING: (
+        "Prioritas: Generate ideas. Build on others, "
+        "defer judgment, quantity over quality."
+    ),
+}
+
+# (reasoning depth, team name, focus) for "specialized" sub-groups, deepest first
+_SPECIALIZED_GROUPS = (
+    (3, "Deep Analysis Team", "Complex reasoning and implications"),
+    (2, "Balanced Team", "Practical solutions and trade-offs"),
+    (1, "Quick Response Team", "Rapid assessment and key insights"),
+)
+
+# Minimum Jaccard similarity of content words for a compromise pair (4+ agents)
+_MIN_SIMILARITY = 0.3
+
+_STOPWORDS = frozenset(
+    """
+    yang dan di ke dari ini itu untuk dengan pada adalah dalam tidak akan juga atau
+    karena bisa ada sebagai oleh lebih kita kami saya anda mereka harus sangat
+    the a an and or of to in on for is are be with that this it as by not we
+    """.split()
+)
+
+_RULES_TEXT = """ATURAN KOLABORASI:
+1. FOKUS pada membangun solusi bersama, bukan menang argumen
+2. Dengarkan dan acknowledge kontribusi agent lain
+3. Cari common ground dan titik kesepakatan
+4. Propose compromises bila ada perbedaan
+5. Build on ide orang lain (gunakan "building on X's point...")
+6. Bertanya untuk klarifikasi, bukan untuk menyerang
+7. Goal: Solusi terintegrasi yang memanfaatkan semua perspektif
+
+"""
+
+
+@dataclass(frozen=True)
 class SubGroup:
     """A sub-group of agents working together"""
     name: str
@@ -24,9 +77,11 @@ class SubGroup:
     coordinator: Optional[str] = None  # Leader agent name
 
 
-@dataclass
+@dataclass(frozen=True)
 class Compromise:
     """Track compromises made during collaboration"""
+    __slots__ = ("iteration", "agents", "original_positions", "compromise_position", "rationale")
+
     iteration: int
     agents: List[str]  # Agents involved in compromise
     original_positions: Dict[str, str]  # Agent -> original stance
@@ -39,7 +94,7 @@ class CollaborativeState:
     """State for collaborative debate mode"""
     strategy: CollaborationStrategy
     groups: List[SubGroup]
-    shared_workspace: Dict[str, any] = field(default_factory=dict)  # Shared notes/ideas
+    shared_workspace: Dict[str, Any] = field(default_factory=dict)  # Shared notes/ideas
     compromises: List[Compromise] = field(default_factory=list)
     consensus_items: List[str] = field(default_factory=list)  # Items all agree on
     divergent_items: List[str] = field(default_factory=list)  # Items with disagreement
@@ -76,15 +131,13 @@ class CollaborationEngine:
             List of SubGroup objects
         """
         if strategy == "balanced":
-            # Distribute evenly
-            groups = []
+            # Distribute evenly; the last group takes the remainder
             group_size = len(personalities) // num_groups
+            offsets = [i * group_size for i in range(num_groups)] + [len(personalities)]
 
+            groups = []
             for i in range(num_groups):
-                start = i * group_size
-                end = start + group_size if i < num_groups - 1 else len(personalities)
-                members = personalities[start:end]
-
+                members = personalities[offsets[i]:offsets[i + 1]]
                 groups.append(
                     SubGroup(
                         name=f"Team {chr(65+i)}",  # Team A, B, C...
@@ -98,39 +151,24 @@ class CollaborationEngine:
 
         elif strategy == "specialized":
             # Group by similar traits/reasoning depth
-            # Simple implementation: by reasoning depth
-            high_depth = [p for p in personalities if p.reasoning_depth >= 3]
-            med_depth = [p for p in personalities if p.reasoning_depth == 2]
-            low_depth = [p for p in personalities if p.reasoning_depth == 1]
+            # Simple implementation: by reasoning depth, bucketed in one pass
+            buckets: Dict[int, List[Personality]] = defaultdict(list)
+            for p in personalities:
+                if p.reasoning_depth >= 1:
+                    buckets[min(p.reasoning_depth, 3)].append(p)
 
             groups = []
-            if high_depth:
-                groups.append(
-                    SubGroup(
-                        name="Deep Analysis Team",
-                        members=high_depth,
-                        focus="Complex reasoning and implications",
-                        coordinator=high_depth[0].name,
-                    )
-                )
-            if med_depth:
-                groups.append(
-                    SubGroup(
-                        name="Balanced Team",
-                        members=med_depth,
-                        focus="Practical solutions and trade-offs",
-                        coordinator=med_depth[0].name,
+            for depth, name, focus in _SPECIALIZED_GROUPS:
+                members = buckets.get(depth)
+                if members:
+                    groups.append(
+                        SubGroup(
+                            name=name,
+                            members=members,
+                            focus=focus,
+                            coordinator=members[0].name,
+                        )
                     )
-                )
-            if low_depth:
-                groups.append(
-                    SubGroup(
-                        name="Quick Response Team",
-                        members=low_depth,
-                        focus="Rapid assessment and key insights",
-                        coordinator=low_depth[0].name,
-                    )
-                )
 
             return groups
 
@@ -156,30 +194,32 @@ class CollaborationEngine:
 
         positions_list = list(agent_positions.items())
 
-        # Check pairs for compromise potential
-        for i, (agent1, pos1) in enumerate(positions_list):
-            for agent2, pos2 in positions_list[i + 1 :]:
-                # Very simple check: same key terms but different emphasis
-                pos1_words = set(pos1.lower().split())
-                pos2_words = set(pos2.lower().split())
-
-                overlap = pos1_words.intersection(pos2_words)
-                if len(overlap) >= 3:  # Some common ground
-                    # Potential compromise
-                    compromise_position = (
-                        f"Synthesized view combining {agent1}'s emphasis on "
-                        f"[key aspect 1] with {agent2}'s focus on [key aspect 2]"
-                    )
+        # Small councils: exact shared-word check; larger ones: most similar content words
+        if len(positions_list) < 4:
+            pair = _overlapping_pair([_tokens(pos) for _, pos in positions_list])
+        else:
+            pair = _similar_pair([_content_tokens(pos) for _, pos in positions_list])
 
-                    return Compromise(
-                        iteration=iteration,
-                        agents=[agent1, agent2],
-                        original_positions={agent1: pos1, agent2: pos2},
-                        compromise_position=compromise_position,
-                        rationale="Detected common ground in positions",
-                    )
+        if pair is None:
+            return None
+
+        i, j = pair
+        agent1, pos1 = positions_list[i]
+        agent2, pos2 = positions_list[j]
 
-        return None
+        # Potential compromise
+        compromise_position = (
+            f"Synthesized view combining {agent1}'s emphasis on "
+            f"[key aspect 1] with {agent2}'s focus on [key aspect 2]"
+        )
+
+        return Compromise(
+            iteration=iteration,
+            agents=[agent1, agent2],
+            original_positions={agent1: pos1, agent2: pos2},
+            compromise_position=compromise_position,
+            rationale="Detected common ground in positions",
+        )
 
     def build_consensus_items(
         self,
@@ -194,32 +234,18 @@ class CollaborationEngine:
         Returns:
             (consensus_items, divergent_items)
         """
-        # Flatten all contributions
-        all_points = []
-        point_to_agents: Dict[str, Set[str]] = {}
-
-        for agent, points in agent_contributions.items():
-            for point in points:
-                # Normalize point
-                normalized = point.lower().strip()
-                all_points.append(normalized)
-
-                if normalized not in point_to_agents:
-                    point_to_agents[normalized] = set()
-                point_to_agents[normalized].add(agent)
+        # Count distinct agents per normalized point (dict.fromkeys dedupes repeats
+        # within one agent while keeping first-seen order)
+        agent_counts: Counter[str] = Counter()
+        for points in agent_contributions.values():
+            agent_counts.update(dict.fromkeys(map(_norm, points)).keys())
 
         # Consensus: mentioned by all or most agents
-        num_agents = len(agent_contributions)
-        consensus_threshold = num_agents * 0.7  # 70% agreement
+        consensus_threshold = len(agent_contributions) * 0.7  # 70% agreement
 
-        consensus = []
-        divergent = []
-
-        for point, agents in point_to_agents.items():
-            if len(agents) >= consensus_threshold:
-                consensus.append(point)
-            elif len(agents) == 1:  # Only one agent
-                divergent.append(point)
+        consensus = [p for p, count in agent_counts.items() if count >= consensus_threshold]
+        # Divergent: only one agent (and not already consensus, e.g. a single-agent council)
+        divergent = [p for p, count in agent_counts.items() if count == 1 < consensus_threshold]
 
         return consensus, divergent
 
@@ -228,7 +254,7 @@ class CollaborationEngine:
         personality: Personality,
         question: str,
         strategy: CollaborationStrategy,
-        shared_workspace: Dict[str, any],
+        shared_workspace: Dict[str, Any],
         group_info: Optional[SubGroup] = None,
     ) -> str:
         """
@@ -244,27 +270,14 @@ class CollaborationEngine:
         Returns:
             System prompt string
         """
-        base = f"""Kamu adalah '{personality.name}'.
-
-TRAITS: {personality.traits}
-PERSPEKTIF: {personality.perspective}
-
-MODE: COLLABORATIVE (bukan kompetitif!)
-STRATEGI: {strategy.value}
-
-ATURAN KOLABORASI:
-1. FOKUS pada membangun solusi bersama, bukan menang argumen
-2. Dengarkan dan acknowledge kontribusi agent lain
-3. Cari common ground dan titik kesepakatan
-4. Propose compromises bila ada perbedaan
-5. Build on ide orang lain (gunakan "building on X's point...")
-6. Bertanya untuk klarifikasi, bukan untuk menyerang
-7. Goal: Solusi terintegrasi yang memanfaatkan semua perspektif
-
-"""
+        parts = [
+            _persona_header(personality.name, personality.traits, personality.perspective),
+            f"MODE: COLLABORATIVE (bukan kompetitif!)\nSTRATEGI: {strategy.value}\n\n",
+            _RULES_TEXT,
+        ]
 
         if group_info:
-            base += f"""
+            parts.append(f"""
 SUB-GROUP INFO:
 - Grup: {group_info.name}
 - Focus area: {group_info.focus}
@@ -272,37 +285,15 @@ SUB-GROUP INFO:
 - Koordinator: {group_info.coordinator}
 
 Kerja sama dalam grup untuk tackle {group_info.focus}.
-"""
+""")
 
         if shared_workspace:
-            base += f"""
-SHARED WORKSPACE (akses semua):
-"""
-            for key, value in shared_workspace.items():
-                base += f"- {key}: {value}\n"
-
-        strategy_guidance = {
-            CollaborationStrategy.CONSENSUS_BUILDING: (
-                "Prioritas: Build consensus. Identify agreements, "
-                "address disagreements dengan dialog konstruktif."
-            ),
-            CollaborationStrategy.PROBLEM_SOLVING: (
-                "Prioritas: Solve problem together. Break down problem, "
-                "contribute expertise, integrate solutions."
-            ),
-            CollaborationStrategy.SYNTHESIS: (
-                "Prioritas: Synthesize viewpoints. Find complementary "
-                "aspects, create holistic perspective."
-            ),
-            CollaborationStrategy.BRAINSTORMING: (
-                "Prioritas: Generate ideas. Build on others, "
-                "defer judgment, quantity over quality."
-            ),
-        }
-
-        base += f"\nSTRATEGY GUIDANCE: {strategy_guidance[strategy]}\n"
-
-        return base
+            parts.append("\nSHARED WORKSPACE (akses semua):\n")
+            parts.append("".join(f"- {key}: {_workspace_value(value)}\n" for key, value in shared_workspace.items()))
+
+        parts.append(f"\nSTRATEGY GUIDANCE: {_STRATEGY_GUIDANCE[strategy]}\n")
+
+        return "".join(parts)
 
 
 def create_collaborative_debate_config(
@@ -337,3 +328,79 @@ def create_collaborative_debate_config(
         engine.state.groups = subgroups
 
     return engine, subgroups
+
+
+@lru_cache(maxsize=4096)
+def _tokens(position: str) -> FrozenSet[str]:
+    """Lowercased word set of a position (positions often repeat across iterations)"""
+    # Interned so the same word across agents/iterations is one shared string object
+    return frozenset(map(sys.intern, position.lower().split()))
+
+
+@lru_cache(maxsize=4096)
+def _norm(point: str) -> str:
+    """Normalize a contribution point for consensus matching"""
+    return sys.intern(point.lower().strip())
+
+
+@lru_cache(maxsize=256)
+def _persona_header(name: str, traits: str, perspective: str) -> str:
+    """Persona block of the collaborative system prompt, formatted once per persona"""
+    return f"""Kamu adalah '{name}'.
+
+TRAITS: {traits}
+PERSPEKTIF: {perspective}
+
+"""
+
+
+@lru_cache(maxsize=4096)
+def _content_tokens(position: str) -> FrozenSet[str]:
+    """Word set of a position without stopwords"""
+    return _tokens(position) - _STOPWORDS
+
+
+def _overlapping_pair(token_sets: List[FrozenSet[str]]) -> Optional[Tuple[int, int]]:
+    """First pair (in agent order) sharing at least 3 words, via an inverted index"""
+    # Inverted index: token -> indices of agents whose position contains it
+    token_index: Dict[str, List[int]] = defaultdict(list)
+    for i, tokens in enumerate(token_sets):
+        for token in tokens:
+            token_index[token].append(i)
+
+    # Count shared tokens only for pairs that actually co-occur
+    overlap_counts: Counter[Tuple[int, int]] = Counter()
+    for indices in token_index.values():
+        for a, i in enumerate(indices):
+            for j in indices[a + 1 :]:
+                overlap_counts[(i, j)] += 1
+
+    # Some common ground
+    candidates = [pair for pair, count in overlap_counts.items() if count >= 3]
+    return min(candidates) if candidates else None
+
+
+def _similar_pair(token_sets: List[FrozenSet[str]]) -> Optional[Tuple[int, int]]:
+    """Most similar pair by exact Jaccard of content words (first pair wins ties)"""
+    # Councils are small (N <= ~10, 45 pairs), so scoring every pair is cheapest
+    best: Optional[Tuple[int, int]] = None
+    best_score = _MIN_SIMILARITY
+    for i, tokens1 in enumerate(token_sets):
+        if not tokens1:
+            continue  # Nothing but stopwords
+        for j in range(i + 1, len(token_sets)):
+            tokens2 = token_sets[j]
+            if not tokens2:
+                continue
+            shared = len(tokens1 & tokens2)
+            score = shared / (len(tokens1) + len(tokens2) - shared)
+            if score >= best_score and (best is None or score > best_score):
+                best, best_score = (i, j), score
+    return best
+
+
+def _workspace_value(value: Any) -> str:
+    """Render a workspace entry; structured values as sorted-key JSON so the prompt text is stable"""
+    if isinstance(value, str):
+        return value
+    return json.dumps(value, ensure_ascii=False, sort_keys=True, default=str)
@@ -1,21 +1,42 @@
 from __future__ import annotations
 
+import asyncio
+import time
+from collections import deque
 from dataclasses import dataclass
-from datetime import datetime
+from functools import lru_cache
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Callable, Dict, List, Optional
+from typing import Callable, Dict, List, Optional, Tuple
 
 from rich.console import Console
+from rich.live import Live
 from rich.markdown import Markdown
+from rich.table import Table
 
-from langfuse.openai import OpenAI
+from langfuse.openai import AsyncOpenAI, OpenAI
 
-from .clients import get_ollama_client
-from .chroma_memory import ChromaCouncilMemory, embed_text, summarize_memory
+from .clients import chat_with_limit, get_async_ollama_client, get_ollama_client, run_async, stream_with_limit
+from .chroma_memory import ChromaCouncilMemory, embed_text, embed_texts, summarize_memory
+from .embed_cache import cache_stats
 from .roles import CouncilRole, council_of_consciousness_roles
 
 console = Console()
 
+_PHASE_NAMES = (
+    "Pembukaan Moderator",
+    "Putaran Argumen",
+    "Sesi Kritik & Sanggahan",
+    "Refleksi Kolektif",
+    "Penutupan Moderator",
+    "Evaluasi Eliminasi",
+)
+# Phase headings are parsed once; only the phase counter is filled in per session
+_PHASE_RENDERABLES: Dict[str, Tuple[str, Markdown]] = {
+    name: (f"[bold cyan]Fase {{index}}/{{total}}: {name}[/bold cyan]", Markdown(f"### {name}"))
+    for name in _PHASE_NAMES
+}
+
 
 @dataclass
 class CouncilConfig:
@@ -27,79 +48,278 @@ class CouncilConfig:
 def _ensure_log_file(title: Optional[str]) -> Path:
     out_dir = Path("debates")
     out_dir.mkdir(parents=True, exist_ok=True)
-    ts = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+    ts = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
     base = (title or "Council").replace(" ", "_")[:64]
     path = out_dir / f"{ts}_{base}_council.md"
     path.write_text(f"# {title or 'Council of Consciousness'}\n\n")
     return path
 
 
-def _append_markdown(path: Path, content: str) -> None:
-    with path.open("a", encoding="utf-8") as f:
-        f.write(content)
+class _TokenBatcher:
+    """
+    on_chunk callback that coalesces streamed tokens and prints them in batches,
+    instead of one styled console.print per token.
+    """
+
+    def __init__(self, style: str, flush_every: int = 16, flush_interval: float = 0.03) -> None:
+        self.style = style
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self._buffer: List[str] = []
+        self._last_flush = time.monotonic()
+
+    def __call__(self, chunk: str) -> None:
+        self._buffer.append(chunk)
+        if len(self._buffer) >= self.flush_every or time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self) -> None:
+        if self._buffer:
+            console.print("".join(self._buffer), style=self.style, end="")
+            self._buffer.clear()
+        self._last_flush = time.monotonic()
+
+
+class _MarkdownLog:
+    """Markdown session log kept open for the whole run; buffered writes are flushed per phase"""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._fh = path.open("a", encoding="utf-8", buffering=8192)
+
+    def append(self, content: str) -> None:
+        self._fh.write(content)
+
+    def flush(self) -> None:
+        self._fh.flush()
+
+    def close(self) -> None:
+        self._fh.close()
+
+
+class _RollingSummary:
+    """
+    Conversation history sent to speakers: the last `keep` contributions verbatim,
+    older ones verbatim until they exceed `max_chars`, after which they are folded
+    into a short summary (one LLM call). Holds the history of a single question.
+    """
+
+    def __init__(
+        self,
+        client: AsyncOpenAI,
+        keep: int = 2,
+        max_chars: int = 2000,
+        model: str = "gemma3:1b",
+    ) -> None:
+        self.client = client
+        self.keep = keep
+        self.max_chars = max_chars
+        self.model = model
+        self.summary = ""
+        self.recent: deque = deque()
+        self._older: List[Dict[str, str]] = []  # Evicted from recent, not yet summarized
+
+    def add(self, message: Dict[str, str]) -> None:
+        self.recent.append(message)
+        while len(self.recent) > self.keep:
+            self._older.append(self.recent.popleft())
+
+    async def _compact(self) -> None:
+        if sum(len(msg["content"]) for msg in self._older) <= self.max_chars:
+            return
+        text = "\n\n".join(f"[{msg['role'].upper()}]: {msg['content']}" for msg in self._older)
+        if self.summary:
+            text = f"[RINGKASAN SEBELUMNYA]: {self.summary}\n\n{text}"
+        try:
+            resp = await chat_with_limit(
+                self.client,
+                model=self.model,
+                messages=[{"role": "user", "content": f"Ringkas 3 kalimat:\n\n{text}"}],
+            )
+            self.summary = (resp.choices[0].message.content or "").strip()
+            self._older.clear()
+        except Exception as e:
+            console.print(f"[yellow]Warning: Could not summarize history: {e}[/yellow]")
+            # Keep the prompt bounded anyway: drop the oldest unsummarized contributions
+            del self._older[:-3]
+
+    async def render(self) -> List[Dict[str, str]]:
+        """History messages for the next phase, compacting first if needed"""
+        await self._compact()
+        messages: List[Dict[str, str]] = []
+        if self.summary:
+            messages.append({"role": "ringkasan", "content": self.summary})
+        messages.extend(self._older)
+        messages.extend(self.recent)
+        return messages
+
+
+def _batch_embed(client: OpenAI, texts: List[str]) -> List[Optional[List[float]]]:
+    """Embed texts in one request; on failure fall back to one request per text"""
+    try:
+        return list(embed_texts(client, texts))
+    except Exception:
+        embeddings: List[Optional[List[float]]] = []
+        for text in texts:
+            try:
+                embeddings.append(embed_text(client, text))
+            except Exception:
+                embeddings.append(None)
+        return embeddings
 
 
-def _stream_role_output(
+def _record_batch(
+    memory: ChromaCouncilMemory,
     client: OpenAI,
-    role: CouncilRole,
     question: str,
-    summary: str,
-    phase: str,
-    previous: List[Dict[str, str]],
-    on_chunk: Callable[[str], None],
+    episodes: List[Tuple[str, str, str, str]],
+) -> None:
+    """
+    Embed (agent, role, phase, content) episodes with one request and queue them
+    for the next memory.flush(). Episodes that cannot be embedded are skipped.
+    """
+    if not episodes:
+        return
+    embeddings = _batch_embed(client, [content for _, _, _, content in episodes])
+    records = [
+        {
+            "question": question,
+            "agent": agent,
+            "role": role,
+            "phase": phase,
+            "content": content,
+            "embedding": emb,
+        }
+        for (agent, role, phase, content), emb in zip(episodes, embeddings)
+        if emb is not None
+    ]
+    if len(records) < len(episodes):
+        console.print(f"[yellow]Warning: {len(episodes) - len(records)} episode gagal di-embed, tidak disimpan[/yellow]")
+    for record in records:
+        memory.queue_episode(**record)
+
+
+@lru_cache(maxsize=None)
+def _role_system_base(
+    title: str,
+    archetype: str,
+    perspective: str,
+    signature: str,
+    reasoning_depth: int,
+    truth_seeking: float,
 ) -> str:
-    system_prompt = (
-        f"Kamu adalah {role.title}.\n\n"
-        f"ARKETIPE: {role.archetype}\n\n"
-        f"PERSPEKTIF ANALITIS: {role.perspective}\n\n"
-        f"GAYA & SIGNATURE: {role.signature}\n\n"
-        f"FASE SAAT INI: {phase}\n\n"
+    """Phase-independent part of a role's system prompt"""
+    return (
+        f"Kamu adalah {title}.\n\n"
+        f"ARKETIPE: {archetype}\n\n"
+        f"PERSPEKTIF ANALITIS: {perspective}\n\n"
+        f"GAYA & SIGNATURE: {signature}\n\n"
         f"ATURAN KETAT:\n"
         f"1. FOKUS ABSOLUT pada pertanyaan - jangan melebar ke topik lain\n"
         f"2. Kontribusi maksimal 4-5 poin kunci yang SANGAT relevan\n"
         f"3. Gunakan perspektif unik dari arketipe Anda\n"
         f"4. Respons terstruktur, evidence-based bila mungkin\n"
-        f"5. Reasoning depth level {role.reasoning_depth} - tingkat kedalaman tinggi\n"
-        f"6. Truth-seeking: {role.truth_seeking} - prioritaskan kebenaran objektif\n"
+        f"5. Reasoning depth level {reasoning_depth} - tingkat kedalaman tinggi\n"
+        f"6. Truth-seeking: {truth_seeking} - prioritaskan kebenaran objektif\n"
         f"7. Engage dengan argumen sebelumnya secara spesifik (cite nama & poin)\n\n"
         "Bahasa Indonesia baku, profesional, dan sesuai character Anda."
     )
-    memory_snippet = (
-        f"=== KONTEKS MEMORI RELEVAN ===\n{summary}\n\n"
-        if summary
-        else ""
-    )
-    previous_text = ""
-    if previous:
-        previous_text = "=== KONTRIBUSI SEBELUMNYA ===\n"
-        for msg in previous[-5:]:  # Last 5 only for focus
-            previous_text += f"\n[{msg['role'].upper()}]: {msg['content']}\n"
-
-    user_prompt = (
-        f"{memory_snippet}"
-        f">>> PERTANYAAN UTAMA: {question} <<<\n\n"
-        f"{previous_text}\n"
-        f"Berikan kontribusi Anda sebagai {role.title}. Tetap ON-TOPIC dan depth maksimal."
+
+
+async def _stream_role_output(
+    client: AsyncOpenAI,
+    role: CouncilRole,
+    question: str,
+    summary: str,
+    phase: str,
+    previous: List[Dict[str, str]],
+    on_chunk: Callable[[str], None],
+) -> str:
+    # Layout for Ollama prefix (KV) cache reuse: the per-session constant part comes
+    # first (role prompt + memory, then the question); per-call parts go last
+    system_prompt = _role_system_base(
+        role.title,
+        role.archetype,
+        role.perspective,
+        role.signature,
+        role.reasoning_depth,
+        role.truth_seeking,
     )
+    if summary:
+        system_prompt += f"\n\n=== KONTEKS MEMORI RELEVAN ===\n{summary}"
+
     messages = [
         {"role": "system", "content": system_prompt},
-        {"role": "user", "content": user_prompt},
+        {"role": "user", "content": f">>> PERTANYAAN UTAMA: {question} <<<"},
     ]
+    if previous:  # Already compacted by _RollingSummary
+        messages.append({"role": "user", "content": "=== KONTRIBUSI SEBELUMNYA ==="})
+        messages.extend(
+            {"role": "user", "content": f"[{msg['role'].upper()}]: {msg['content']}"} for msg in previous
+        )
+    messages.append(
+        {
+            "role": "user",
+            "content": (
+                f"FASE SAAT INI: {phase}\n\n"
+                f"Berikan kontribusi Anda sebagai {role.title}. Tetap ON-TOPIC dan depth maksimal."
+            ),
+        }
+    )
     parts: List[str] = []
-    stream = client.chat.completions.create(model=role.model, messages=messages, stream=True)
-    for event in stream:
-        try:
-            delta = event.choices[0].delta.content or ""
-        except Exception:
-            delta = ""
+    async for event in stream_with_limit(client, model=role.model, messages=messages):
+        choices = event.choices  # Empty on usage-only chunks
+        delta = getattr(choices[0].delta, "content", None) if choices else None
         if delta:
             parts.append(delta)
             on_chunk(delta)
     return "".join(parts).strip()
 
 
+async def _stream_speakers(
+    client: AsyncOpenAI,
+    speakers: List[CouncilRole],
+    question: str,
+    summary: str,
+    phase: str,
+    previous: List[Dict[str, str]],
+) -> List[str]:
+    """
+    Run all speakers of a phase concurrently.
+
+    Progress is shown in a transient live table (one row per speaker); the full
+    contributions are returned in speaker order for printing afterwards.
+    """
+    sizes = {role.key: 0 for role in speakers}
+    done = set()
+
+    def render() -> Table:
+        table = Table(show_header=False, box=None, padding=(0, 1))
+        for role in speakers:
+            status = "selesai" if role.key in done else "menulis..."
+            table.add_row(
+                f"[bold {role.color}]{role.title}[/bold {role.color}]",
+                f"[dim]{status} {sizes[role.key]} karakter[/dim]",
+            )
+        return table
+
+    async def speak(role: CouncilRole) -> str:
+        def on_chunk(chunk: str) -> None:
+            sizes[role.key] += len(chunk)
+
+        content = await _stream_role_output(
+            client, role, question, summary, phase=phase, previous=previous, on_chunk=on_chunk
+        )
+        done.add(role.key)
+        return content
+
+    with Live(get_renderable=render, console=console, refresh_per_second=4, transient=True):
+        return list(await asyncio.gather(*[speak(role) for role in speakers]))
+
+
 def _choose_elimination(
     client: OpenAI,
+    memory: ChromaCouncilMemory,
     question: str,
     contributions: Dict[str, str],
     reflections: Dict[str, str],
@@ -117,19 +337,40 @@ def _choose_elimination(
         "\nPilih satu peran yang kontribusinya paling lemah atau tidak relevan. "
         "Jika semua layak dipertahankan tulis 'None'. Jawab hanya nama peran."
     )
-    messages = [
-        {"role": "system", "content": "Anda evaluator netral. Jawab sangat singkat."},
-        {"role": "user", "content": "\n".join(prompt_lines)},
-    ]
-    resp = client.chat.completions.create(model="gemma3:1b", messages=messages)
-    result = resp.choices[0].message.content.strip()
+    prompt = "\n".join(prompt_lines)
+
+    # Semantic cache: a near-identical evaluation seen before reuses its verdict
+    try:
+        prompt_emb = embed_text(client, prompt)
+    except Exception:
+        prompt_emb = None
+    result = memory.get_cached_verdict(prompt_emb) if prompt_emb is not None else None
+
+    if result is None:
+        messages = [
+            {"role": "system", "content": "Anda evaluator netral. Jawab sangat singkat."},
+            {"role": "user", "content": prompt},
+        ]
+        resp = client.chat.completions.create(model="gemma3:1b", messages=messages)
+        result = resp.choices[0].message.content.strip()
+        if prompt_emb is not None:
+            try:
+                memory.store_verdict(prompt_emb, result)
+            except Exception as e:
+                console.print(f"[yellow]Warning: Could not cache elimination verdict: {e}[/yellow]")
+
     if result.lower() == "none":
         return None
     return result
 
 
 def run_council_of_consciousness(config: CouncilConfig) -> None:
+    run_async(run_council_of_consciousness_async(config))
+
+
+async def run_council_of_consciousness_async(config: CouncilConfig) -> None:
     client = get_ollama_client()
+    async_client = get_async_ollama_client()
     memory = ChromaCouncilMemory()
     roles = council_of_consciousness_roles()
     moderator = roles[0]
@@ -137,199 +378,171 @@ def run_council_of_consciousness(config: CouncilConfig) -> None:
     critic = next(r for r in roles if r.key == "critic")
 
     log_path = _ensure_log_file(config.title or config.question)
-    _append_markdown(log_path, f"**Pertanyaan:** {config.question}\n\n")
-
-    total_phases = 5 + (1 if config.elimination else 0)
-    phase_index = 1
-
-    def announce_phase(name: str, heading: str) -> None:
-        nonlocal phase_index
-        console.rule(f"[bold cyan]Fase {phase_index}/{total_phases}: {name}[/bold cyan]")
-        console.print(Markdown(f"### {name}"))
-        _append_markdown(log_path, f"\n## {heading}\n\n")
-        phase_index += 1
-
-    # Retrieve context using ChromaDB's semantic search
-    similar_scored = []
+    log = _MarkdownLog(log_path)
     try:
-        query_emb = embed_text(client, config.question)
-        similar_scored = memory.fetch_similar(query_emb, limit=3, min_similarity=0.6)
-    except Exception as e:
-        console.print(f"[yellow]Warning: Could not fetch similar memories: {e}[/yellow]")
+        log.append(f"**Pertanyaan:** {config.question}\n\n")
+
+        total_phases = 5 + (1 if config.elimination else 0)
+        phase_index = 1
+
+        def announce_phase(name: str, heading: str) -> None:
+            nonlocal phase_index
+            rule_text, title = _PHASE_RENDERABLES[name]
+            console.rule(rule_text.format(index=phase_index, total=total_phases))
+            console.print(title)
+            log.flush()  # Previous phase is complete on disk
+            memory.flush()  # One ChromaDB insert for the previous phase's episodes
+            log.append(f"\n## {heading}\n\n")
+            phase_index += 1
+
+        # Retrieve context: the question embedding (an API round-trip) overlaps the
+        # recent-episode read, then one in-process similarity search
+        query_emb, recent = await asyncio.gather(
+            asyncio.to_thread(embed_text, client, config.question),
+            asyncio.to_thread(memory.fetch_recent, 5),
+            return_exceptions=True,
+        )
+        if isinstance(recent, BaseException):
+            console.print(f"[yellow]Warning: Could not fetch recent memories: {recent}[/yellow]")
+            recent = []
         similar_scored = []
+        if isinstance(query_emb, BaseException):
+            console.print(f"[yellow]Warning: Could not fetch similar memories: {query_emb}[/yellow]")
+        else:
+            try:
+                similar_scored = memory.fetch_similar_fast(query_emb, limit=3, min_similarity=0.6)
+            except Exception as e:
+                console.print(f"[yellow]Warning: Could not fetch similar memories: {e}[/yellow]")
 
-    summary = ""
-    try:
-        recent = memory.fetch_recent(limit=5)
-        # Pass scored records to summarize_memory for better context
-        similar_records = [rec for _, rec in similar_scored]
-        summary = summarize_memory(
+        summary = ""
+        try:
+            # Pass scored records to summarize_memory for better context
+            summary = summarize_memory(
+                client,
+                config.question,
+                recent,
+                scored_records=similar_scored
+            )
+        except Exception as e:
+            console.print(f"[yellow]Warning: Could not summarize memory: {e}[/yellow]")
+            summary = ""
+
+        announce_phase("Pembukaan Moderator", "Pembukaan Moderator")
+        console.print(f"[bold]{moderator.title}[/bold]: ", end="")
+        history = _RollingSummary(async_client)
+        batcher = _TokenBatcher(moderator.color)
+        moderator_opening = await _stream_role_output(
+            async_client,
+            moderator,
+            config.question,
+            summary,
+            phase="Pembukaan Moderator",
+            previous=[],
+            on_chunk=batcher,
+        )
+        batcher.flush()
+        console.print()
+        history.add({"role": "moderator", "content": moderator_opening})
+        log.append(moderator_opening + "\n\n")
+        # Single-speaker episodes are embedded and stored together at the end
+        deferred_episodes = [(moderator.title, moderator.key, "opening", moderator_opening)]
+
+        announce_phase("Putaran Argumen", "Putaran Argumen")
+        contributions: Dict[str, str] = {}
+        # Speakers argue concurrently, each seeing the contributions made before this phase
+        contents = await _stream_speakers(
+            async_client, speakers, config.question, summary, phase="Argumen Awal", previous=await history.render()
+        )
+        for role, content in zip(speakers, contents):
+            console.print(f"[bold {role.color}]{role.title}[/bold {role.color}]: ", end="")
+            console.print(content, style=role.color)
+            history.add({"role": role.key, "content": content})
+            log.append(f"### {role.title}\n\n{content}\n\n")
+            contributions[role.title] = content
+        _record_batch(
+            memory,
             client,
             config.question,
-            recent,
-            scored_records=similar_scored
+            [(role.title, role.key, "argument", content) for role, content in zip(speakers, contents)],
         )
-    except Exception as e:
-        console.print(f"[yellow]Warning: Could not summarize memory: {e}[/yellow]")
-        summary = ""
-
-    announce_phase("Pembukaan Moderator", "Pembukaan Moderator")
-    console.print(f"[bold]{moderator.title}[/bold]: ", end="")
-    prev_messages: List[Dict[str, str]] = []
-    moderator_opening = _stream_role_output(
-        client,
-        moderator,
-        config.question,
-        summary,
-        phase="Pembukaan Moderator",
-        previous=[],
-        on_chunk=lambda chunk: console.print(chunk, style=moderator.color, end=""),
-    )
-    console.print()
-    prev_messages.append({"role": "moderator", "content": moderator_opening})
-    _append_markdown(log_path, moderator_opening + "\n\n")
-    try:
-        emb = embed_text(client, moderator_opening)
-    except Exception:
-        emb = None
-    memory.record_episode(
-        question=config.question,
-        agent=moderator.title,
-        role=moderator.key,
-        phase="opening",
-        content=moderator_opening,
-        embedding=emb,
-    )
 
-    announce_phase("Putaran Argumen", "Putaran Argumen")
-    contributions: Dict[str, str] = {}
-    for role in speakers:
-        console.print(f"[bold {role.color}]{role.title}[/bold {role.color}]: ", end="")
-        content = _stream_role_output(
-            client,
-            role,
+        announce_phase("Sesi Kritik & Sanggahan", "Sesi Kritik & Sanggahan")
+        console.print(f"[bold {critic.color}]{critic.title}[/bold {critic.color}]: ", end="")
+        batcher = _TokenBatcher(critic.color)
+        critic_content = await _stream_role_output(
+            async_client,
+            critic,
             config.question,
             summary,
-            phase="Argumen Awal",
-            previous=prev_messages,
-            on_chunk=lambda chunk, color=role.color: console.print(chunk, style=color, end=""),
+            phase="Analisis & Kritik",
+            previous=await history.render(),
+            on_chunk=batcher,
         )
+        batcher.flush()
         console.print()
-        prev_messages.append({"role": role.key, "content": content})
-        _append_markdown(log_path, f"### {role.title}\n\n{content}\n\n")
-        contributions[role.title] = content
-        try:
-            emb = embed_text(client, content)
-        except Exception:
-            emb = None
-        memory.record_episode(
-            question=config.question,
-            agent=role.title,
-            role=role.key,
-            phase="argument",
-            content=content,
-            embedding=emb,
+        history.add({"role": critic.key, "content": critic_content})
+        log.append(critic_content + "\n\n")
+        deferred_episodes.append((critic.title, critic.key, "critique", critic_content))
+
+        announce_phase("Refleksi Kolektif", "Refleksi Kolektif")
+        reflections: Dict[str, str] = {}
+        contents = await _stream_speakers(
+            async_client, speakers, config.question, summary, phase="Refleksi", previous=await history.render()
         )
-
-    announce_phase("Sesi Kritik & Sanggahan", "Sesi Kritik & Sanggahan")
-    console.print(f"[bold {critic.color}]{critic.title}[/bold {critic.color}]: ", end="")
-    critic_content = _stream_role_output(
-        client,
-        critic,
-        config.question,
-        summary,
-        phase="Analisis & Kritik",
-        previous=prev_messages,
-        on_chunk=lambda chunk, color=critic.color: console.print(chunk, style=color, end=""),
-    )
-    console.print()
-    prev_messages.append({"role": critic.key, "content": critic_content})
-    _append_markdown(log_path, critic_content + "\n\n")
-    try:
-        emb = embed_text(client, critic_content)
-    except Exception:
-        emb = None
-    memory.record_episode(
-        question=config.question,
-        agent=critic.title,
-        role=critic.key,
-        phase="critique",
-        content=critic_content,
-        embedding=emb,
-    )
-
-    announce_phase("Refleksi Kolektif", "Refleksi Kolektif")
-    reflections: Dict[str, str] = {}
-    for role in speakers:
-        console.print(f"[bold {role.color}]{role.title}[/bold {role.color}] refleksi: ", end="")
-        content = _stream_role_output(
+        for role, content in zip(speakers, contents):
+            console.print(f"[bold {role.color}]{role.title}[/bold {role.color}] refleksi: ", end="")
+            console.print(content, style=role.color)
+            reflections[role.title] = content
+            history.add({"role": role.key, "content": content})
+            log.append(f"- **{role.title}:** {content}\n")
+        _record_batch(
+            memory,
             client,
-            role,
+            config.question,
+            [(role.title, role.key, "reflection", content) for role, content in zip(speakers, contents)],
+        )
+
+        announce_phase("Penutupan Moderator", "Penutupan Moderator")
+        console.print(f"[bold]{moderator.title}[/bold]: ", end="")
+        batcher = _TokenBatcher(moderator.color)
+        closing = await _stream_role_output(
+            async_client,
+            moderator,
             config.question,
             summary,
-            phase="Refleksi",
-            previous=prev_messages,
-            on_chunk=lambda chunk, color=role.color: console.print(chunk, style=color, end=""),
+            phase="Penutupan",
+            previous=await history.render(),
+            on_chunk=batcher,
         )
+        batcher.flush()
         console.print()
-        reflections[role.title] = content
-        prev_messages.append({"role": role.key, "content": content})
-        _append_markdown(log_path, f"- **{role.title}:** {content}\n")
-        try:
-            emb = embed_text(client, content)
-        except Exception:
-            emb = None
-        memory.record_episode(
-            question=config.question,
-            agent=role.title,
-            role=role.key,
-            phase="reflection",
-            content=content,
-            embedding=emb,
+        log.append(closing + "\n")
+        deferred_episodes.append((moderator.title, moderator.key, "closing", closing))
+
+        if config.elimination:
+            announce_phase("Evaluasi Eliminasi", "Evaluasi Eliminasi")
+            elimination_target = _choose_elimination(client, memory, config.question, contributions, reflections)
+            if elimination_target:
+                console.print(Markdown(f"**Eliminasi yang disarankan:** {elimination_target}"))
+                log.append(f"\n**Eliminasi yang disarankan:** {elimination_target}\n")
+                deferred_episodes.append(
+                    ("Evaluator", "eliminator", "elimination", f"Eliminasi yang disarankan: {elimination_target}")
+                )
+
+        _record_batch(memory, client, config.question, deferred_episodes)
+        stats = cache_stats()
+        console.print(
+            f"[dim]Embedding cache: {stats['hits']} hit ({stats['disk_hits']} dari disk) / "
+            f"{stats['misses']} miss ({stats['hit_rate']:.0%})[/dim]"
         )
+    finally:
+        # Store episodes queued since the last phase even if a phase failed
+        try:
+            memory.close()
+        except Exception as e:
+            console.print(f"[yellow]Warning: Could not store queued episodes: {e}[/yellow]")
+        log.close()
 
-    announce_phase("Penutupan Moderator", "Penutupan Moderator")
-    console.print(f"[bold]{moderator.title}[/bold]: ", end="")
-    closing = _stream_role_output(
-        client,
-        moderator,
-        config.question,
-        summary,
-        phase="Penutupan",
-        previous=prev_messages,
-        on_chunk=lambda chunk: console.print(chunk, style=moderator.color, end=""),
-    )
-    console.print()
-    _append_markdown(log_path, closing + "\n")
-    try:
-        emb = embed_text(client, closing)
-    except Exception:
-        emb = None
-    memory.record_episode(
-        question=config.question,
-        agent=moderator.title,
-        role=moderator.key,
-        phase="closing",
-        content=closing,
-        embedding=emb,
-    )
-
-    if config.elimination:
-        announce_phase("Evaluasi Eliminasi", "Evaluasi Eliminasi")
-        elimination_target = _choose_elimination(client, config.question, contributions, reflections)
-        if elimination_target:
-            console.print(Markdown(f"**Eliminasi yang disarankan:** {elimination_target}"))
-            _append_markdown(log_path, f"\n**Eliminasi yang disarankan:** {elimination_target}\n")
-            memory.record_episode(
-                question=config.question,
-                agent="Evaluator",
-                role="eliminator",
-                phase="elimination",
-                content=f"Eliminasi yang disarankan: {elimination_target}",
-                embedding=None,
-            )
-
-    memory.close()
     console.print(Markdown(f"\n**Log Markdown:** `{log_path}`"))
 
 
@@ -2,121 +2,25 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from enum import Enum
-from typing import List, Optional, Dict, Any
+from functools import lru_cache
+from itertools import zip_longest
+from typing import Any, Callable, Dict, Final, List, Optional, Tuple
 
 from .types import Personality
 
 
-class DebateFormat(Enum):
-    """Supported debate formats"""
-    FREEFORM = "freeform"  # Original unstructured
-    OXFORD = "oxford"  # Oxford-style: proposition vs opposition
-    SOCRATIC = "socratic"  # Socratic questioning method
-    DEVILS_ADVOCATE = "devils_advocate"  # One agent challenges all
-    PARLIAMENTARY = "parliamentary"  # Parliamentary rules with motions
-    FISHBOWL = "fishbowl"  # Inner/outer circle discussion
-
-
-@dataclass
-class OxfordDebateConfig:
-    """Oxford-style debate configuration"""
-    motion: str  # The proposition being debated
-    proposition_team: List[Personality]
-    opposition_team: List[Personality]
-    opening_statement_time: int = 1  # Iterations for opening
-    rebuttal_rounds: int = 2
-    closing_statement_time: int = 1
-
-
-@dataclass
-class SocraticConfig:
-    """Socratic questioning configuration"""
-    questioner: Personality  # The Socrates figure
-    respondents: List[Personality]
-    question_depth: int = 3  # How many follow-up questions per topic
-    focus_on_definitions: bool = True
-    expose_assumptions: bool = True
-
-
-@dataclass
-class DevilsAdvocateConfig:
-    """Devil's Advocate configuration"""
-    devil: Personality  # The challenger
-    proponents: List[Personality]  # Those being challenged
-    challenge_every_claim: bool = True
-    require_evidence: bool = True
-
-
-@dataclass
-class ParliamentaryConfig:
-    """Parliamentary debate configuration"""
-    motion: str
-    government_team: List[Personality]  # Propose motion
-    opposition_team: List[Personality]  # Oppose motion
-    speaker_order: List[str]  # Ordered list of speaker names
-    points_of_order_allowed: bool = True
-    points_of_information_allowed: bool = True
-
-
-class DebateFormatEngine:
-    """Engine for managing different debate formats"""
+# Prompt headers are built once at import; each call only fills in the placeholders
+_BASE_TEMPLATE: Final[str] = """Kamu adalah '{name}'.
 
-    def __init__(self, format_type: DebateFormat):
-        self.format = format_type
-        self.config: Optional[Any] = None
-
-    def generate_format_prompt(
-        self,
-        personality: Personality,
-        role: str,
-        phase: str,
-        format_config: Any,
-    ) -> str:
-        """
-        Generate format-specific system prompt
-
-        Args:
-            personality: Agent personality
-            role: Role in this format (e.g., "proposition", "questioner")
-            phase: Current phase
-            format_config: Format-specific configuration
-
-        Returns:
-            System prompt
-        """
-        base = f"""Kamu adalah '{personality.name}'.
-
-TRAITS: {personality.traits}
-PERSPEKTIF: {personality.perspective}
+TRAITS: {traits}
+PERSPEKTIF: {perspective}
 
 """
 
-        if self.format == DebateFormat.OXFORD:
-            return self._oxford_prompt(personality, role, phase, format_config)
-
-        elif self.format == DebateFormat.SOCRATIC:
-            return self._socratic_prompt(personality, role, phase, format_config)
-
-        elif self.format == DebateFormat.DEVILS_ADVOCATE:
-            return self._devils_advocate_prompt(personality, role, phase, format_config)
-
-        elif self.format == DebateFormat.PARLIAMENTARY:
-            return self._parliamentary_prompt(personality, role, phase, format_config)
-
-        return base
-
-    def _oxford_prompt(
-        self,
-        personality: Personality,
-        role: str,
-        phase: str,
-        config: OxfordDebateConfig,
-    ) -> str:
-        """Oxford-style debate prompt"""
-        base = f"""
+_OXFORD_HEADER: Final[str] = """
 FORMAT: OXFORD DEBATE
-MOTION: "{config.motion}"
-YOUR ROLE: {role.upper()}
+MOTION: "{motion}"
+YOUR ROLE: {role}
 PHASE: {phase}
 
 OXFORD RULES:
@@ -129,54 +33,74 @@ OXFORD RULES:
 
 """
 
-        if role == "proposition":
-            base += f"""
+_SOCRATIC_HEADER: Final[str] = """
+FORMAT: SOCRATIC DIALOGUE
+YOUR ROLE: {role}
+PHASE: {phase}
+
+SOCRATIC METHOD:
+- Questioner asks probing questions to expose assumptions
+- Respondents answer and refine their thinking
+- Goal: Reach deeper understanding through dialectic
+
+"""
+
+_DEVILS_ADVOCATE_HEADER: Final[str] = """
+FORMAT: DEVIL'S ADVOCATE
+YOUR ROLE: {role}
+
+"""
+
+_PARLIAMENTARY_HEADER: Final[str] = """
+FORMAT: PARLIAMENTARY DEBATE
+MOTION: "{motion}"
+YOUR ROLE: {role}
+PHASE: {phase}
+
+PARLIAMENTARY RULES:
+1. Government defends motion, Opposition opposes
+2. Formal speaker order must be followed
+3. Address the "Speaker" (moderator)
+4. Points of Order: Challenge rule violations
+5. Points of Information: Brief interjections (15 sec)
+6. No interrupting except for procedural points
+
+FORMAL LANGUAGE:
+- "Honorable Speaker..."
+- "The Honorable member from..."
+- "I rise to make a Point of Order..."
+- "Will the speaker yield for a Point of Information?"
+
+"""
+
+
+# Role and phase fragments, appended to the header as-is ({...} fields are
+# filled from the format config)
+_OXFORD_ROLE_BLOCKS: Dict[str, str] = {
+    "proposition": """
 TUGAS ANDA:
 - Defend the motion dengan argumen kuat
 - Provide evidence dan examples
 - Anticipate opposition arguments
 - Build case yang persuasif untuk audience
-"""
-        elif role == "opposition":
-            base += f"""
+""",
+    "opposition": """
 TUGAS ANDA:
 - Challenge the motion dengan counter-arguments
 - Expose weaknesses dalam proposition case
 - Provide alternative perspectives
 - Persuade audience motion should NOT pass
-"""
-
-        if phase == "opening":
-            base += "\n➤ OPENING STATEMENT: Lay out your main arguments (3-5 poin kunci)"
-        elif phase == "rebuttal":
-            base += "\n➤ REBUTTAL: Address opponent arguments AND reinforce your case"
-        elif phase == "closing":
-            base += "\n➤ CLOSING: Summarize why your side should win, address key clashes"
-
-        return base
-
-    def _socratic_prompt(
-        self,
-        personality: Personality,
-        role: str,
-        phase: str,
-        config: SocraticConfig,
-    ) -> str:
-        """Socratic questioning prompt"""
-        base = f"""
-FORMAT: SOCRATIC DIALOGUE
-YOUR ROLE: {role.upper()}
-PHASE: {phase}
-
-SOCRATIC METHOD:
-- Questioner asks probing questions to expose assumptions
-- Respondents answer and refine their thinking
-- Goal: Reach deeper understanding through dialectic
+""",
+}
 
-"""
+_OXFORD_PHASE_BLOCKS: Dict[str, str] = {
+    "opening": "\n➤ OPENING STATEMENT: Lay out your main arguments (3-5 poin kunci)",
+    "rebuttal": "\n➤ REBUTTAL: Address opponent arguments AND reinforce your case",
+    "closing": "\n➤ CLOSING: Summarize why your side should win, address key clashes",
+}
 
-        if role == "questioner":
-            base += f"""
+_SOCRATIC_ROLE_BLOCKS: Dict[str, str] = {
+    "questioner": """
 TUGAS ANDA (SOCRATES):
 1. Ask clarifying questions: "What do you mean by X?"
 2. Probe assumptions: "What are you assuming when you say Y?"
@@ -188,13 +112,10 @@ ATURAN:
 - HANYA bertanya, JANGAN argue
 - Questions harus genuine, bukan rhetorical attacks
 - Guide respondent to examine their own beliefs
-- {"Focus on definitions" if config.focus_on_definitions else ""}
-- {"Expose hidden assumptions" if config.expose_assumptions else ""}
-
+{optional_rules}
 Format: "Question: [your question]"
-"""
-        elif role == "respondent":
-            base += f"""
+""",
+    "respondent": """
 TUGAS ANDA (RESPONDENT):
 - Answer questions thoughtfully dan honestly
 - Examine your own assumptions when questioned
@@ -205,26 +126,11 @@ ATURAN:
 - Jangan defensive
 - Think through implications dari answer Anda
 - Collaborate dalam pencarian kebenaran
-"""
-
-        return base
-
-    def _devils_advocate_prompt(
-        self,
-        personality: Personality,
-        role: str,
-        phase: str,
-        config: DevilsAdvocateConfig,
-    ) -> str:
-        """Devil's Advocate prompt"""
-        base = f"""
-FORMAT: DEVIL'S ADVOCATE
-YOUR ROLE: {role.upper()}
-
-"""
+""",
+}
 
-        if role == "devil":
-            base += f"""
+_DEVILS_ADVOCATE_ROLE_BLOCKS: Dict[str, str] = {
+    "devil": """
 TUGAS ANDA (DEVIL'S ADVOCATE):
 Anda adalah CHALLENGER yang bertugas:
 
@@ -243,11 +149,8 @@ ATURAN:
   * "What evidence supports...?"
   * "Consider this counter-example..."
   * "That assumes X, but what if...?"
-
-{"REQUIRE EVIDENCE: Selalu minta bukti untuk claims" if config.require_evidence else ""}
-"""
-        elif role == "proponent":
-            base += f"""
+{evidence}""",
+    "proponent": """
 TUGAS ANDA (PROPONENT):
 - Present your ideas dengan clear logic
 - Provide evidence saat di-challenge
@@ -259,42 +162,11 @@ ATURAN:
 - Expect to be challenged on everything
 - This is HELPFUL - makes your ideas stronger
 - Don't take challenges personally
-"""
-
-        return base
+""",
+}
 
-    def _parliamentary_prompt(
-        self,
-        personality: Personality,
-        role: str,
-        phase: str,
-        config: ParliamentaryConfig,
-    ) -> str:
-        """Parliamentary debate prompt"""
-        base = f"""
-FORMAT: PARLIAMENTARY DEBATE
-MOTION: "{config.motion}"
-YOUR ROLE: {role.upper()}
-PHASE: {phase}
-
-PARLIAMENTARY RULES:
-1. Government defends motion, Opposition opposes
-2. Formal speaker order must be followed
-3. Address the "Speaker" (moderator)
-4. Points of Order: Challenge rule violations
-5. Points of Information: Brief interjections (15 sec)
-6. No interrupting except for procedural points
-
-FORMAL LANGUAGE:
-- "Honorable Speaker..."
-- "The Honorable member from..."
-- "I rise to make a Point of Order..."
-- "Will the speaker yield for a Point of Information?"
-
-"""
-
-        if role == "government":
-            base += f"""
+_PARLIAMENTARY_ROLE_BLOCKS: Dict[str, str] = {
+    "government": """
 GOVERNMENT TEAM:
 - Propose and defend the motion
 - Burden of proof is on YOU
@@ -305,9 +177,8 @@ STRATEGY:
 - Opening: Define motion, lay out case
 - Middle: Reinforce points, rebut opposition
 - Closing: Summarize why motion should pass
-"""
-        elif role == "opposition":
-            base += f"""
+""",
+    "opposition": """
 OPPOSITION TEAM:
 - Challenge and oppose the motion
 - Rebut government case
@@ -318,15 +189,220 @@ STRATEGY:
 - Opening: Challenge definitions, set up opposition case
 - Middle: Tear down government arguments
 - Closing: Summarize why motion should fail
-"""
+""",
+}
+
+_POINTS_OF_ORDER_LINE: Final[str] = "\n✓ Points of Order ALLOWED: Flag rule violations"
+_POINTS_OF_INFORMATION_LINE: Final[str] = "\n✓ Points of Information ALLOWED: Brief interjections to opponent"
+
+
+# Prompts depend only on these scalar inputs (configs hold unhashable teams), so
+# repeated (role, phase) turns across rounds are served from the caches below.
+@lru_cache(maxsize=512)
+def _render_base(name: str, traits: str, perspective: str) -> str:
+    return _BASE_TEMPLATE.format(name=name, traits=traits, perspective=perspective)
+
+
+@lru_cache(maxsize=512)
+def _render_oxford(motion: str, role: str, phase: str) -> str:
+    return "".join((
+        _OXFORD_HEADER.format(motion=motion, role=role.upper(), phase=phase),
+        _OXFORD_ROLE_BLOCKS.get(role, ""),
+        _OXFORD_PHASE_BLOCKS.get(phase, ""),
+    ))
+
+
+@lru_cache(maxsize=512)
+def _render_socratic(role: str, phase: str, focus_on_definitions: bool, expose_assumptions: bool) -> str:
+    role_block = _SOCRATIC_ROLE_BLOCKS.get(role, "")
+    if role == "questioner":
+        # Disabled rules are left out entirely rather than rendered as empty bullets
+        optional_rules = []
+        if focus_on_definitions:
+            optional_rules.append("- Focus on definitions\n")
+        if expose_assumptions:
+            optional_rules.append("- Expose hidden assumptions\n")
+        role_block = role_block.format(optional_rules="".join(optional_rules))
+    return "".join((_SOCRATIC_HEADER.format(role=role.upper(), phase=phase), role_block))
+
+
+@lru_cache(maxsize=512)
+def _render_devils_advocate(role: str, require_evidence: bool) -> str:
+    role_block = _DEVILS_ADVOCATE_ROLE_BLOCKS.get(role, "")
+    if role == "devil":
+        role_block = role_block.format(
+            evidence="\nREQUIRE EVIDENCE: Selalu minta bukti untuk claims\n" if require_evidence else "",
+        )
+    return "".join((_DEVILS_ADVOCATE_HEADER.format(role=role.upper()), role_block))
+
+
+@lru_cache(maxsize=512)
+def _render_parliamentary(
+    motion: str,
+    role: str,
+    phase: str,
+    points_of_order_allowed: bool,
+    points_of_information_allowed: bool,
+) -> str:
+    return "".join((
+        _PARLIAMENTARY_HEADER.format(motion=motion, role=role.upper(), phase=phase),
+        _PARLIAMENTARY_ROLE_BLOCKS.get(role, ""),
+        _POINTS_OF_ORDER_LINE if points_of_order_allowed else "",
+        _POINTS_OF_INFORMATION_LINE if points_of_information_allowed else "",
+    ))
 
-        if config.points_of_order_allowed:
-            base += "\n✓ Points of Order ALLOWED: Flag rule violations"
 
-        if config.points_of_information_allowed:
-            base += "\n✓ Points of Information ALLOWED: Brief interjections to opponent"
+class DebateFormat(Enum):
+    """Supported debate formats"""
+    FREEFORM = "freeform"  # Original unstructured
+    OXFORD = "oxford"  # Oxford-style: proposition vs opposition
+    SOCRATIC = "socratic"  # Socratic questioning method
+    DEVILS_ADVOCATE = "devils_advocate"  # One agent challenges all
+    PARLIAMENTARY = "parliamentary"  # Parliamentary rules with motions
+    FISHBOWL = "fishbowl"  # Inner/outer circle discussion
+
+
+_FORMAT_BY_VALUE: Dict[str, DebateFormat] = {f.value: f for f in DebateFormat}
 
-        return base
+
+def resolve_format(name: str) -> DebateFormat:
+    """
+    Debate format from its string value (e.g. "oxford")
+
+    Raises:
+        ValueError: If name is not a known format
+    """
+    try:
+        return _FORMAT_BY_VALUE[name]
+    except KeyError:
+        raise ValueError(f"Unknown debate format: {name!r}") from None
+
+
+@dataclass(frozen=True)
+class OxfordDebateConfig:
+    """Oxford-style debate configuration"""
+    motion: str  # The proposition being debated
+    proposition_team: Tuple[Personality, ...]
+    opposition_team: Tuple[Personality, ...]
+    opening_statement_time: int = 1  # Iterations for opening
+    rebuttal_rounds: int = 2
+    closing_statement_time: int = 1
+
+
+@dataclass(frozen=True)
+class SocraticConfig:
+    """Socratic questioning configuration"""
+    questioner: Personality  # The Socrates figure
+    respondents: Tuple[Personality, ...]
+    question_depth: int = 3  # How many follow-up questions per topic
+    focus_on_definitions: bool = True
+    expose_assumptions: bool = True
+
+
+@dataclass(frozen=True)
+class DevilsAdvocateConfig:
+    """Devil's Advocate configuration"""
+    devil: Personality  # The challenger
+    proponents: Tuple[Personality, ...]  # Those being challenged
+    challenge_every_claim: bool = True
+    require_evidence: bool = True
+
+
+@dataclass(frozen=True)
+class ParliamentaryConfig:
+    """Parliamentary debate configuration"""
+    motion: str
+    government_team: Tuple[Personality, ...]  # Propose motion
+    opposition_team: Tuple[Personality, ...]  # Oppose motion
+    speaker_order: Tuple[str, ...]  # Ordered list of speaker names
+    points_of_order_allowed: bool = True
+    points_of_information_allowed: bool = True
+
+
+class DebateFormatEngine:
+    """Engine for managing different debate formats"""
+
+    def __init__(self, format_type: DebateFormat):
+        self.format = format_type
+        self.config: Optional[Any] = None
+        # Formats without a handler (freeform, fishbowl) use the persona prompt
+        self._dispatch: Dict[DebateFormat, Callable[[Personality, str, str, Any], str]] = {
+            DebateFormat.OXFORD: self._oxford_prompt,
+            DebateFormat.SOCRATIC: self._socratic_prompt,
+            DebateFormat.DEVILS_ADVOCATE: self._devils_advocate_prompt,
+            DebateFormat.PARLIAMENTARY: self._parliamentary_prompt,
+        }
+
+    def generate_format_prompt(
+        self,
+        personality: Personality,
+        role: str,
+        phase: str,
+        format_config: Any,
+    ) -> str:
+        """
+        Generate format-specific system prompt
+
+        Args:
+            personality: Agent personality
+            role: Role in this format (e.g., "proposition", "questioner")
+            phase: Current phase
+            format_config: Format-specific configuration
+
+        Returns:
+            System prompt
+        """
+        handler = self._dispatch.get(self.format)
+        if handler:
+            return handler(personality, role, phase, format_config)
+
+        return _render_base(personality.name, personality.traits, personality.perspective)
+
+    def _oxford_prompt(
+        self,
+        personality: Personality,
+        role: str,
+        phase: str,
+        config: OxfordDebateConfig,
+    ) -> str:
+        """Oxford-style debate prompt"""
+        return _render_oxford(config.motion, role, phase)
+
+    def _socratic_prompt(
+        self,
+        personality: Personality,
+        role: str,
+        phase: str,
+        config: SocraticConfig,
+    ) -> str:
+        """Socratic questioning prompt"""
+        return _render_socratic(role, phase, config.focus_on_definitions, config.expose_assumptions)
+
+    def _devils_advocate_prompt(
+        self,
+        personality: Personality,
+        role: str,
+        phase: str,
+        config: DevilsAdvocateConfig,
+    ) -> str:
+        """Devil's Advocate prompt"""
+        return _render_devils_advocate(role, config.require_evidence)
+
+    def _parliamentary_prompt(
+        self,
+        personality: Personality,
+        role: str,
+        phase: str,
+        config: ParliamentaryConfig,
+    ) -> str:
+        """Parliamentary debate prompt"""
+        return _render_parliamentary(
+            config.motion,
+            role,
+            phase,
+            config.points_of_order_allowed,
+            config.points_of_information_allowed,
+        )
 
 
 def create_oxford_debate(
@@ -345,8 +421,8 @@ def create_oxford_debate(
     Returns:
         OxfordDebateConfig
     """
-    prop_team = all_agents[:proposition_count]
-    opp_team = all_agents[proposition_count:]
+    prop_team = tuple(all_agents[:proposition_count])
+    opp_team = tuple(all_agents[proposition_count:])
 
     return OxfordDebateConfig(
         motion=motion,
@@ -366,7 +442,7 @@ def create_socratic_dialog(
     """Create Socratic questioning configuration"""
     return SocraticConfig(
         questioner=questioner,
-        respondents=respondents,
+        respondents=tuple(respondents),
         question_depth=depth,
         focus_on_definitions=True,
         expose_assumptions=True,
@@ -380,7 +456,7 @@ def create_devils_advocate_debate(
     """Create Devil's Advocate configuration"""
     return DevilsAdvocateConfig(
         devil=devil,
-        proponents=proponents,
+        proponents=tuple(proponents),
         challenge_every_claim=True,
         require_evidence=True,
     )
@@ -392,17 +468,11 @@ def create_parliamentary_debate(
     government_count: int = 3,
 ) -> ParliamentaryConfig:
     """Create Parliamentary debate configuration"""
-    gov_team = all_agents[:government_count]
-    opp_team = all_agents[government_count:]
-
-    # Alternating speaker order
-    speaker_order = []
-    max_len = max(len(gov_team), len(opp_team))
-    for i in range(max_len):
-        if i < len(gov_team):
-            speaker_order.append(gov_team[i].name)
-        if i < len(opp_team):
-            speaker_order.append(opp_team[i].name)
+    gov_team = tuple(all_agents[:government_count])
+    opp_team = tuple(all_agents[government_count:])
+
+    # Alternating speaker order; the longer team's extra speakers go last
+    speaker_order = tuple(p.name for pair in zip_longest(gov_team, opp_team) for p in pair if p is not None)
 
     return ParliamentaryConfig(
         motion=motion,
@@ -1,14 +1,85 @@
 from __future__ import annotations
 
-from typing import Optional, Dict, Any, List
-from pydantic import BaseModel, Field
-from langfuse.openai import OpenAI
+import asyncio
+import json
+import logging
+import re
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Optional, Dict, Final, List, Mapping, Tuple
+from pydantic import BaseModel, ConfigDict, Field
 
 from .types import Personality
 
+if TYPE_CHECKING:
+    # langfuse (and .clients, which imports it) load on first LLM use, so importing
+    # this module for templates or offline fallbacks stays cheap
+    from langfuse.openai import AsyncOpenAI, OpenAI
+
+try:  # Optional faster parser for LLM JSON replies
+    import orjson
+
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+logger = logging.getLogger(__name__)
+
+_DOMAIN_SYSTEM_PROMPT = "You are an expert at creating debate agent personalities. Reply ONLY with valid JSON."
+_PERSPECTIVES_SYSTEM_PROMPT = "Generate diverse expert perspectives. Reply ONLY with JSON array."
+
+# Prompt bodies are module constants; only the fields are filled in per call
+_DOMAIN_PROMPT_TEMPLATE: Final[str] = """Generate a debate agent personality for the domain: "{domain}"
+
+Agent name: {name}
+
+Provide:
+1. Traits (3-5 key characteristics for this domain expert)
+2. Perspective (their analytical framework and how they evaluate arguments)
+
+Format your response as JSON:
+{{
+  "traits": "trait1, trait2, trait3, ...",
+  "perspective": "description of their perspective..."
+}}
+
+Examples:
+- Domain "medical ethics" → traits: "Hippocratic, patient-centered, risk-aware", perspective: "Evaluate through lens of patient welfare, medical evidence, and ethical principles"
+- Domain "cybersecurity" → traits: "Paranoid productive, threat-modeling mindset, defense-in-depth", perspective: "Assess security implications, attack vectors, and mitigation strategies"
+
+Generate for: {domain}
+"""
+
+_PERSPECTIVES_PROMPT_TEMPLATE: Final[str] = """Generate {count} diverse perspectives for experts in: "{domain}"
+
+These should be DIFFERENT viewpoints within the same domain. Examples:
+- Medical ethics: (1) Patient autonomy focus, (2) Public health utilitarian, (3) Professional ethics, (4) Cost-effectiveness
+- Climate policy: (1) Economic transition, (2) Environmental justice, (3) Technological solutions, (4) Policy pragmatist
+
+Provide {count} perspectives as JSON array:
+[
+  {{"traits": "...", "perspective": "..."}},
+  ...
+]
+"""
+
+DOMAIN_CACHE_SIZE = 256
+
+# (domain, name) -> generated traits/perspective, shared by all factories so
+# re-creating a council for the same domain skips the LLM call
+_domain_cache: "OrderedDict[Tuple[str, str], Dict[str, str]]" = OrderedDict()
+
+# A ```json fenced block; searched on its own first so braces in prose before the
+# fence aren't taken as the payload. Failing that, the outermost {...} / [...]
+_JSON_FENCED = re.compile(r"```(?:json)?\s*(\{.*?\}|\[.*?\])\s*```", re.DOTALL)
+_JSON_BARE = re.compile(r"\{.*\}|\[.*\]", re.DOTALL)
+
 
 class AgentCreationRequest(BaseModel):
     """Request to create a custom agent dynamically"""
+    # Immutable user input; unknown fields are rejected instead of silently ignored
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
     name: str
     domain: Optional[str] = None  # e.g., "medical ethics", "quantum physics"
     traits: Optional[str] = None  # User-defined traits
@@ -29,8 +100,39 @@ class DynamicAgentFactory:
     3. Parameter tuning per agent
     """
 
-    def __init__(self, client: Optional[OpenAI] = None):
+    def __init__(self, client: Optional[OpenAI] = None, async_client: Optional[AsyncOpenAI] = None):
         self.client = client
+        self.async_client = async_client
+        # Only factories built by with_ollama() may fall back to the shared async client
+        self._shared_async = False
+
+    @classmethod
+    def with_ollama(cls) -> "DynamicAgentFactory":
+        """
+        Factory backed by the shared Ollama clients, so every create_* call reuses
+        their pooled keep-alive (and, with h2 installed, HTTP/2) connections
+        instead of a caller-built client per session.
+        """
+        from .clients import get_ollama_client
+
+        factory = cls(client=get_ollama_client())
+        factory._shared_async = True
+        return factory
+
+    def _async_client(self) -> Optional[AsyncOpenAI]:
+        """
+        Async client for the *_async methods: the explicit one, or the shared Ollama
+        client for with_ollama() factories. None means the *_async methods run the
+        caller's sync client in a worker thread instead (it may point at another
+        endpoint than the shared client).
+        """
+        if self.async_client is not None:
+            return self.async_client
+        if self._shared_async:
+            from .clients import get_async_ollama_client
+
+            return get_async_ollama_client()
+        return None
 
     def create_custom_agent(self, request: AgentCreationRequest) -> Personality:
         """
@@ -42,30 +144,38 @@ class DynamicAgentFactory:
         Returns:
             Personality object ready for debate
         """
-        # If traits/perspective not provided, generate them
-        if not request.traits or not request.perspective:
-            if request.domain and self.client:
-                # Auto-generate from domain
-                generated = self._generate_from_domain(request.domain, request.name)
-                traits = request.traits or generated["traits"]
-                perspective = request.perspective or generated["perspective"]
-            else:
-                # Use defaults
-                traits = request.traits or "Analytical, logical, evidence-based"
-                perspective = request.perspective or "Evaluate arguments objectively with critical thinking"
-        else:
-            traits = request.traits
-            perspective = request.perspective
-
-        return Personality(
-            name=request.name,
-            model=request.model,
-            traits=traits,
-            perspective=perspective,
-            reasoning_depth=request.reasoning_depth,
-            truth_seeking=request.truth_seeking,
-            persistence=request.persistence,
+        generated = None
+        # If traits/perspective not provided, generate them from the domain
+        if (not request.traits or not request.perspective) and request.domain and self.client:
+            generated = self._generate_from_domain(request.domain, request.name)
+        return _build_personality(request, generated)
+
+    async def create_custom_agent_async(self, request: AgentCreationRequest) -> Personality:
+        """Async variant of create_custom_agent"""
+        generated = None
+        if (not request.traits or not request.perspective) and request.domain and (self.client or self.async_client):
+            generated = await self._generate_from_domain_async(request.domain, request.name)
+        return _build_personality(request, generated)
+
+    async def create_agents_async(self, requests: List[AgentCreationRequest]) -> List[Personality]:
+        """
+        Create several agents concurrently; domain generation calls run in parallel
+        (bounded by the shared client concurrency limit).
+
+        Args:
+            requests: Agent creation parameters
+
+        Returns:
+            Personality objects, in the same order as requests
+        """
+        results = await asyncio.gather(
+            *(self.create_custom_agent_async(request) for request in requests),
+            return_exceptions=True,
         )
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+        return list(results)
 
     def _generate_from_domain(self, domain: str, name: str) -> Dict[str, str]:
         """
@@ -84,62 +194,49 @@ class DynamicAgentFactory:
                 "perspective": f"Evaluate from {domain} perspective",
             }
 
-        prompt = f"""Generate a debate agent personality for the domain: "{domain}"
-
-Agent name: {name}
-
-Provide:
-1. Traits (3-5 key characteristics for this domain expert)
-2. Perspective (their analytical framework and how they evaluate arguments)
-
-Format your response as JSON:
-{{
-  "traits": "trait1, trait2, trait3, ...",
-  "perspective": "description of their perspective..."
-}}
-
-Examples:
-- Domain "medical ethics" → traits: "Hippocratic, patient-centered, risk-aware", perspective: "Evaluate through lens of patient welfare, medical evidence, and ethical principles"
-- Domain "cybersecurity" → traits: "Paranoid productive, threat-modeling mindset, defense-in-depth", perspective: "Assess security implications, attack vectors, and mitigation strategies"
-
-Generate for: {domain}
-"""
+        cached = _cached_domain(domain, name)
+        if cached:
+            return cached
 
         try:
             response = self.client.chat.completions.create(
                 model="qwen2.5:3b",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are an expert at creating debate agent personalities. Reply ONLY with valid JSON.",
-                    },
-                    {"role": "user", "content": prompt},
-                ],
+                messages=_domain_messages(domain, name),
                 temperature=0.8,
+                response_format={"type": "json_object"},
             )
+            return _store_domain(domain, name, _parse_domain_result(response.choices[0].message.content, domain))
 
-            import json
-            result_text = response.choices[0].message.content.strip()
+        except Exception as e:
+            logger.warning("Error auto-generating personality: %s", e)
+            return _domain_fallback(domain)
 
-            # Extract JSON from response (handle markdown code blocks)
-            if "```json" in result_text:
-                result_text = result_text.split("```json")[1].split("```")[0].strip()
-            elif "```" in result_text:
-                result_text = result_text.split("```")[1].split("```")[0].strip()
+    async def _generate_from_domain_async(self, domain: str, name: str) -> Dict[str, str]:
+        """Async variant of _generate_from_domain"""
+        client = self._async_client()
+        if not client:
+            # Sync client only (or none): keep the caller's endpoint, off the event loop
+            return await asyncio.to_thread(self._generate_from_domain, domain, name)
 
-            result = json.loads(result_text)
+        cached = _cached_domain(domain, name)
+        if cached:
+            return cached
 
-            return {
-                "traits": result.get("traits", f"Expert in {domain}"),
-                "perspective": result.get("perspective", f"Analyze from {domain} viewpoint"),
-            }
+        try:
+            from .clients import chat_with_limit
+
+            response = await chat_with_limit(
+                client,
+                model="qwen2.5:3b",
+                messages=_domain_messages(domain, name),
+                temperature=0.8,
+                response_format={"type": "json_object"},
+            )
+            return _store_domain(domain, name, _parse_domain_result(response.choices[0].message.content, domain))
 
         except Exception as e:
-            print(f"Error auto-generating personality: {e}")
-            return {
-                "traits": f"Expert in {domain}, analytical, thorough",
-                "perspective": f"Evaluate arguments from {domain} perspective with rigor",
-            }
+            logger.warning("Error auto-generating personality: %s", e)
+            return _domain_fallback(domain)
 
     def create_domain_council(
         self,
@@ -160,32 +257,19 @@ Generate for: {domain}
         """
         # Generate different perspectives within the domain
         perspectives = self._generate_domain_perspectives(domain, num_agents - (1 if include_critic else 0))
+        return _council_personalities(domain, perspectives, include_critic)
 
-        agents = []
-        for i, persp in enumerate(perspectives):
-            request = AgentCreationRequest(
-                name=f"{domain.title()} Expert {i+1}",
-                domain=domain,
-                traits=persp["traits"],
-                perspective=persp["perspective"],
-                reasoning_depth=2,
-                truth_seeking=0.8,
-            )
-            agents.append(self.create_custom_agent(request))
-
-        # Add critic if requested
-        if include_critic:
-            critic_request = AgentCreationRequest(
-                name=f"{domain.title()} Skeptic",
-                domain=domain,
-                traits="Contrarian, critical, challenges assumptions",
-                perspective=f"Critique {domain} arguments from skeptical viewpoint, expose weaknesses",
-                reasoning_depth=3,
-                truth_seeking=0.95,
-            )
-            agents.append(self.create_custom_agent(critic_request))
-
-        return agents
+    async def create_domain_council_async(
+        self,
+        domain: str,
+        num_agents: int = 5,
+        include_critic: bool = True,
+    ) -> List[Personality]:
+        """Async variant of create_domain_council"""
+        perspectives = await self._generate_domain_perspectives_async(
+            domain, num_agents - (1 if include_critic else 0)
+        )
+        return _council_personalities(domain, perspectives, include_critic)
 
     def _generate_domain_perspectives(self, domain: str, count: int) -> List[Dict[str, str]]:
         """Generate diverse perspectives within a domain"""
@@ -199,88 +283,232 @@ Generate for: {domain}
                 for i in range(count)
             ]
 
-        prompt = f"""Generate {count} diverse perspectives for experts in: "{domain}"
+        try:
+            response = self.client.chat.completions.create(
+                model="qwen2.5:3b",
+                messages=_perspectives_messages(domain, count),
+                temperature=0.9,
+            )
+            return _parse_perspectives(response.choices[0].message.content, domain, count)
 
-These should be DIFFERENT viewpoints within the same domain. Examples:
-- Medical ethics: (1) Patient autonomy focus, (2) Public health utilitarian, (3) Professional ethics, (4) Cost-effectiveness
-- Climate policy: (1) Economic transition, (2) Environmental justice, (3) Technological solutions, (4) Policy pragmatist
+        except Exception as e:
+            logger.warning("Error generating perspectives: %s", e)
+            return _perspectives_fallback(domain, count)
 
-Provide {count} perspectives as JSON array:
-[
-  {{"traits": "...", "perspective": "..."}},
-  ...
-]
-"""
+    async def _generate_domain_perspectives_async(self, domain: str, count: int) -> List[Dict[str, str]]:
+        """Async variant of _generate_domain_perspectives"""
+        client = self._async_client()
+        if not client:
+            return await asyncio.to_thread(self._generate_domain_perspectives, domain, count)
 
         try:
-            response = self.client.chat.completions.create(
+            from .clients import chat_with_limit
+
+            response = await chat_with_limit(
+                client,
                 model="qwen2.5:3b",
-                messages=[
-                    {"role": "system", "content": "Generate diverse expert perspectives. Reply ONLY with JSON array."},
-                    {"role": "user", "content": prompt},
-                ],
+                messages=_perspectives_messages(domain, count),
                 temperature=0.9,
             )
+            return _parse_perspectives(response.choices[0].message.content, domain, count)
+
+        except Exception as e:
+            logger.warning("Error generating perspectives: %s", e)
+            return _perspectives_fallback(domain, count)
+
+
+def _build_personality(request: AgentCreationRequest, generated: Optional[Dict[str, str]]) -> Personality:
+    """Personality from a request, filling missing traits/perspective from generated or defaults"""
+    if generated:
+        traits = request.traits or generated["traits"]
+        perspective = request.perspective or generated["perspective"]
+    else:
+        traits = request.traits or "Analytical, logical, evidence-based"
+        perspective = request.perspective or "Evaluate arguments objectively with critical thinking"
+
+    return _make_personality(
+        request.name,
+        traits,
+        perspective,
+        reasoning_depth=request.reasoning_depth,
+        truth_seeking=request.truth_seeking,
+        persistence=request.persistence,
+        model=request.model,
+    )
+
+
+def _make_personality(
+    name: str,
+    traits: str,
+    perspective: str,
+    reasoning_depth: int = 2,
+    truth_seeking: float = 0.8,
+    persistence: float = 0.6,
+    model: str = "qwen2.5:3b",
+) -> Personality:
+    """Personality from trusted internal values (defaults match AgentCreationRequest)"""
+    return Personality(
+        name=name,
+        model=model,
+        traits=traits,
+        perspective=perspective,
+        reasoning_depth=reasoning_depth,
+        truth_seeking=truth_seeking,
+        persistence=persistence,
+    )
+
+
+def _council_personalities(
+    domain: str,
+    perspectives: List[Dict[str, str]],
+    include_critic: bool,
+) -> List[Personality]:
+    """
+    Domain council: one expert per perspective, plus the critic. Perspectives are
+    already complete (see _parse_perspectives), so no AgentCreationRequest is needed.
+    """
+    title = domain.title()
+    agents = [
+        _make_personality(f"{title} Expert {i+1}", persp["traits"], persp["perspective"])
+        for i, persp in enumerate(perspectives)
+    ]
+
+    # Add critic if requested
+    if include_critic:
+        agents.append(
+            _make_personality(
+                f"{title} Skeptic",
+                "Contrarian, critical, challenges assumptions",
+                f"Critique {domain} arguments from skeptical viewpoint, expose weaknesses",
+                reasoning_depth=3,
+                truth_seeking=0.95,
+            )
+        )
+    return agents
 
-            import json
-            result_text = response.choices[0].message.content.strip()
 
-            # Extract JSON
-            if "```json" in result_text:
-                result_text = result_text.split("```json")[1].split("```")[0].strip()
-            elif "```" in result_text:
-                result_text = result_text.split("```")[1].split("```")[0].strip()
+def _extract_json(result_text: str) -> str:
+    """JSON payload of a reply: the fenced block if any, else the outermost object/array"""
+    m = _JSON_FENCED.search(result_text)
+    if m:
+        return m.group(1)
+    m = _JSON_BARE.search(result_text)
+    return m.group(0) if m else result_text.strip()
 
-            perspectives = json.loads(result_text)
-            return perspectives[:count]
 
-        except Exception as e:
-            print(f"Error generating perspectives: {e}")
-            return [
-                {
-                    "traits": f"{domain} expert, analytical, perspective {i+1}",
-                    "perspective": f"Analyze {domain} from angle {i+1}",
-                }
-                for i in range(count)
-            ]
+def _domain_messages(domain: str, name: str) -> List[Dict[str, str]]:
+    prompt = _DOMAIN_PROMPT_TEMPLATE.format(domain=domain, name=name)
+    return [
+        {"role": "system", "content": _DOMAIN_SYSTEM_PROMPT},
+        {"role": "user", "content": prompt},
+    ]
+
+
+def _parse_domain_result(result_text: str, domain: str) -> Dict[str, str]:
+    result = _json_loads(_extract_json(result_text))
+    return {
+        "traits": result.get("traits", f"Expert in {domain}"),
+        "perspective": result.get("perspective", f"Analyze from {domain} viewpoint"),
+    }
+
+
+def _cached_domain(domain: str, name: str) -> Optional[Dict[str, str]]:
+    result = _domain_cache.get((domain, name))
+    if result is None:
+        return None
+    _domain_cache.move_to_end((domain, name))
+    return dict(result)
+
+
+def _store_domain(domain: str, name: str, result: Dict[str, str]) -> Dict[str, str]:
+    """Cache a generated persona (fallbacks are not cached, so failures are retried)"""
+    _domain_cache[(domain, name)] = dict(result)
+    if len(_domain_cache) > DOMAIN_CACHE_SIZE:
+        _domain_cache.popitem(last=False)
+    return result
+
+
+def _domain_fallback(domain: str) -> Dict[str, str]:
+    return {
+        "traits": f"Expert in {domain}, analytical, thorough",
+        "perspective": f"Evaluate arguments from {domain} perspective with rigor",
+    }
+
+
+def _perspectives_messages(domain: str, count: int) -> List[Dict[str, str]]:
+    prompt = _PERSPECTIVES_PROMPT_TEMPLATE.format(domain=domain, count=count)
+    return [
+        {"role": "system", "content": _PERSPECTIVES_SYSTEM_PROMPT},
+        {"role": "user", "content": prompt},
+    ]
+
+
+def _parse_perspectives(result_text: str, domain: str, count: int) -> List[Dict[str, str]]:
+    """
+    Exactly `count` complete perspectives from one batched reply. Missing or
+    malformed entries are filled from the fallback, so building the council
+    never needs a per-agent generation call.
+    """
+    perspectives = _json_loads(_extract_json(result_text))
+    if not isinstance(perspectives, list):
+        raise ValueError("expected a JSON array of perspectives")
+    fallback = _perspectives_fallback(domain, count)
+    for i, entry in enumerate(perspectives[:count]):
+        if isinstance(entry, dict):
+            fallback[i] = {
+                "traits": str(entry.get("traits") or fallback[i]["traits"]),
+                "perspective": str(entry.get("perspective") or fallback[i]["perspective"]),
+            }
+    return fallback
+
+
+def _perspectives_fallback(domain: str, count: int) -> List[Dict[str, str]]:
+    return [
+        {
+            "traits": f"{domain} expert, analytical, perspective {i+1}",
+            "perspective": f"Analyze {domain} from angle {i+1}",
+        }
+        for i in range(count)
+    ]
 
 
-# Pre-defined templates for quick access
-DOMAIN_TEMPLATES = {
-    "medical": {
+# Pre-defined templates for quick access (keys are lowercase). Read-only at both
+# levels, so callers can share them without copying
+DOMAIN_TEMPLATES: Mapping[str, Mapping[str, str]] = MappingProxyType({
+    "medical": MappingProxyType({
         "name": "Medical Council",
         "domain": "medical ethics and healthcare",
         "description": "Experts in medical ethics, patient care, public health, and healthcare policy",
-    },
-    "legal": {
+    }),
+    "legal": MappingProxyType({
         "name": "Legal Council",
         "domain": "law and jurisprudence",
         "description": "Legal experts covering constitutional law, ethics, precedent, and justice",
-    },
-    "tech": {
+    }),
+    "tech": MappingProxyType({
         "name": "Technology Council",
         "domain": "technology and software engineering",
         "description": "Tech experts in software, security, scalability, and innovation",
-    },
-    "climate": {
+    }),
+    "climate": MappingProxyType({
         "name": "Climate Council",
         "domain": "climate science and environmental policy",
         "description": "Climate scientists, policy experts, economists, and activists",
-    },
-    "business": {
+    }),
+    "business": MappingProxyType({
         "name": "Business Strategy Council",
         "domain": "business strategy and economics",
         "description": "Business strategists, economists, market analysts, and entrepreneurs",
-    },
-    "education": {
+    }),
+    "education": MappingProxyType({
         "name": "Education Council",
         "domain": "education and pedagogy",
         "description": "Educators, policy makers, researchers, and student advocates",
-    },
-}
+    }),
+})
 
 
-def get_domain_template(template_name: str) -> Optional[Dict[str, Any]]:
+def get_domain_template(template_name: str) -> Optional[Mapping[str, str]]:
     """Get pre-defined domain template"""
     return DOMAIN_TEMPLATES.get(template_name.lower())
 
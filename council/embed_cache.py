@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import hashlib
+import sqlite3
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from langfuse.openai import OpenAI
+
+EMBED_CACHE_SIZE = 2048
+EMBED_CACHE_PATH = Path("debates/.embed_cache.sqlite")
+
+# (model, sha1 of text) -> embedding; keyed by digest so long texts aren't kept alive
+_cache: "OrderedDict[Tuple[str, str], Tuple[float, ...]]" = OrderedDict()
+_lock = threading.Lock()
+_hits = 0
+_disk_hits = 0
+_misses = 0
+
+
+class DiskEmbedCache:
+    """Embeddings persisted in SQLite as float32 blobs, so they survive restarts"""
+
+    def __init__(self, path: Path = EMBED_CACHE_PATH) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Autocommit; embed_text is also called from worker threads (guarded by _disk_lock)
+        self.conn = sqlite3.connect(str(path), isolation_level=None, check_same_thread=False)
+        self.conn.execute("CREATE TABLE IF NOT EXISTS e(k TEXT PRIMARY KEY, v BLOB)")
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        row = self.conn.execute("SELECT v FROM e WHERE k = ?", (key,)).fetchone()
+        return np.frombuffer(row[0], dtype=np.float32) if row else None
+
+    def put(self, key: str, vec: List[float]) -> None:
+        self.conn.execute(
+            "INSERT OR REPLACE INTO e(k, v) VALUES (?, ?)",
+            (key, np.asarray(vec, dtype=np.float32).tobytes()),
+        )
+
+
+_disk: Optional[DiskEmbedCache] = None
+_disk_failed = False
+_disk_lock = threading.Lock()
+
+
+def _disk_cache() -> Optional[DiskEmbedCache]:
+    """Open the disk cache on first use; None if it can't be opened"""
+    global _disk, _disk_failed
+    if _disk is None and not _disk_failed:
+        try:
+            _disk = DiskEmbedCache()
+        except Exception as e:
+            _disk_failed = True
+            print(f"Warning: embedding disk cache disabled: {e}")
+    return _disk
+
+
+def _key(model: str, text: str) -> Tuple[str, str]:
+    return model, hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def embed_text_cached(client: OpenAI, text: str, model: str) -> List[float]:
+    """
+    Embed text, serving repeated texts from an in-process LRU cache backed by a
+    SQLite cache on disk (EMBED_CACHE_PATH).
+
+    Embeddings are deterministic for a given model, so a hit skips the request.
+
+    Args:
+        client: OpenAI-compatible client
+        text: Text to embed
+        model: Embedding model name
+
+    Returns:
+        Embedding vector
+    """
+    global _hits, _disk_hits, _misses
+    key = _key(model, text)
+    with _lock:
+        cached = _cache.get(key)
+        if cached is not None:
+            _cache.move_to_end(key)
+            _hits += 1
+            return list(cached)
+
+    # RAM miss: try the on-disk cache before calling the API
+    disk_key = f"{model}:{key[1]}"
+    embedding: Optional[List[float]] = None
+    with _disk_lock:
+        disk = _disk_cache()
+        if disk is not None:
+            try:
+                stored = disk.get(disk_key)
+                if stored is not None:
+                    embedding = stored.tolist()
+            except sqlite3.Error:
+                pass
+
+    from_disk = embedding is not None
+    if not from_disk:
+        resp = client.embeddings.create(model=model, input=[text])
+        embedding = resp.data[0].embedding
+        if disk is not None:
+            with _disk_lock:
+                try:
+                    disk.put(disk_key, embedding)
+                except sqlite3.Error:
+                    pass
+
+    with _lock:
+        if from_disk:
+            _disk_hits += 1
+        else:
+            _misses += 1
+        _cache[key] = tuple(embedding)
+        _cache.move_to_end(key)
+        if len(_cache) > EMBED_CACHE_SIZE:
+            _cache.popitem(last=False)
+    return embedding
+
+
+def cache_stats() -> Dict[str, float]:
+    """Hit/miss counters of the embedding cache (hits include disk hits)"""
+    with _lock:
+        hits = _hits + _disk_hits
+        total = hits + _misses
+        return {
+            "hits": hits,
+            "disk_hits": _disk_hits,
+            "misses": _misses,
+            "size": len(_cache),
+            "hit_rate": hits / total if total else 0.0,
+        }
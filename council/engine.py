@@ -1,14 +1,26 @@
 from __future__ import annotations
 
-from typing import List, Dict, Callable
+import asyncio
+import io
+import json
+from collections import Counter
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
+from typing import Any, List, Dict, Callable, Iterator, Optional, Tuple
 from rich.console import Console
 from rich.panel import Panel
 from rich.table import Table
 from rich.live import Live
 from rich.layout import Layout
-from langfuse.openai import OpenAI
+from langfuse.openai import AsyncOpenAI
 from .types import Personality, DebateConfig, DebateState, Argument, Vote, IterationResult
-from .clients import get_ollama_client
+from .clients import (
+    chat_with_limit,
+    get_async_ollama_client,
+    get_ollama_client,
+    run_async,
+    stream_with_limit,
+)
 from .focus_scorer import batch_score_arguments, generate_focus_report, get_focus_warnings
 
 
@@ -28,35 +40,126 @@ COLOR_PALETTE = [
 ]
 
 
+class ConsoleWriter:
+    """
+    Non-blocking console output for coroutines.
+
+    Print calls are handed to a single worker thread, which renders them in submission
+    order, so Rich I/O never stalls the event loop while other agents are streaming.
+    """
+
+    def __init__(self, console: Console) -> None:
+        self.console = console
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="council-console")
+        self._pending: List[Future] = []
+
+    def print(self, *objects: Any, **kwargs: Any) -> None:
+        """Queue a console.print call; returns immediately"""
+        self._pending.append(self._executor.submit(self.console.print, *objects, **kwargs))
+
+    async def flush(self) -> None:
+        """Wait until everything queued so far has been rendered"""
+        pending, self._pending = self._pending, []
+        if pending:
+            await asyncio.gather(*(asyncio.wrap_future(f) for f in pending))
+
+    async def close(self) -> None:
+        await self.flush()
+        self._executor.shutdown(wait=False)
+
+
+class _Checkpointer:
+    """
+    Runs save_callback on a worker thread so checkpoint I/O overlaps the next round.
+
+    Saves run one at a time on a deep-copied snapshot; if several checkpoints pile up
+    while one is being written, only the newest is saved.
+    """
+
+    def __init__(self, save_callback: Callable[[DebateState], None]) -> None:
+        self._save = save_callback
+        self._queued: Optional[DebateState] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def submit(self, state: DebateState) -> None:
+        # Snapshot: the engine keeps mutating state while the save runs
+        self._queued = state.model_copy(deep=True)
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._drain())
+
+    async def _drain(self) -> None:
+        while self._queued is not None:
+            snapshot, self._queued = self._queued, None
+            try:
+                await asyncio.to_thread(self._save, snapshot)
+            except Exception as e:
+                console.print(f"[red]Autosave gagal: {e}[/red]")
+
+    async def wait(self) -> None:
+        """Wait for pending checkpoints to be written"""
+        if self._task is not None:
+            await self._task
+
+
+@lru_cache(maxsize=None)
 def _color_for(name: str) -> str:
-    idx = abs(hash(name)) % len(COLOR_PALETTE)
-    return COLOR_PALETTE[idx]
-
-
-def _stream_completion(client: OpenAI, model: str, messages: List[Dict[str, str]], on_chunk: Callable[[str], None]) -> str:
-    parts: List[str] = []
-    stream = client.chat.completions.create(model=model, messages=messages, stream=True)
-    for event in stream:
-        try:
-            delta = event.choices[0].delta.content or ""
-        except Exception:
-            delta = ""
-        if delta:
-            parts.append(delta)
-            on_chunk(delta)
-    return "".join(parts).strip()
-
-
-def _prompt_for_argument(
-    client: OpenAI,
+    # 64-bit FNV-1a: unlike hash(), stable across processes (colors survive resumes)
+    h = 0xCBF29CE484222325
+    for b in name.encode("utf-8"):
+        h ^= b
+        h = (h * 0x100000001B3) & 0xFFFFFFFFFFFFFFFF
+    return COLOR_PALETTE[h % len(COLOR_PALETTE)]
+
+
+async def _stream_completion_async(
+    client: AsyncOpenAI,
+    model: str,
+    messages: List[Dict[str, str]],
+    max_chars: Optional[int] = None,
+    on_chunk: Optional[Callable[[str], None]] = None,
+    limiter: Optional[asyncio.Semaphore] = None,
+) -> str:
+    buf = io.StringIO()
+    events = stream_with_limit(client, limiter=limiter, model=model, messages=messages)
+    try:
+        async for event in events:
+            choices = event.choices  # Empty on usage-only chunks
+            delta = getattr(choices[0].delta, "content", None) if choices else None
+            if delta:
+                buf.write(delta)
+                if on_chunk:
+                    on_chunk(delta)
+                if max_chars and buf.tell() >= max_chars:
+                    break
+    finally:
+        await events.aclose()  # Releases the concurrency slot and closes the stream now
+    return buf.getvalue().strip()
+
+
+OPENING_PRIOR_BLOCK = "(Argumen pembuka - belum ada argumen sebelumnya)"
+
+
+def _persona_meta(persona: Personality) -> Tuple[str, str]:
+    """(color, stats tag) used in every agent header; built once per debate"""
+    return (
+        _color_for(persona.name),
+        f"[dim italic]│ Depth:{persona.reasoning_depth} Truth:{persona.truth_seeking:.2f}[/dim italic]",
+    )
+
+
+def _argument_listing(arguments: List[Argument]) -> str:
+    """Serialize arguments as '- author: content' lines (built once per iteration)"""
+    return "\n".join(f"- {a.author}: {a.content}" for a in arguments)
+
+
+def _argument_messages(
     persona: Personality,
     question: str,
-    prior_arguments: List[Argument],
+    prior_block: str,
     reasoning_depth: int,
-    on_chunk: Callable[[str], None],
     rag_system=None,
     iteration: int = 0,
-) -> str:
+) -> List[Dict[str, str]]:
     # Build base system prompt
     base_system_prompt = (
         f"Kamu adalah '{persona.name}'. Traits: {persona.traits}. Perspektif: {persona.perspective}.\n\n"
@@ -82,7 +185,7 @@ def _prompt_for_argument(
     else:
         system_prompt = base_system_prompt
 
-    messages = [
+    return [
         {
             "role": "system",
             "content": system_prompt,
@@ -91,16 +194,81 @@ def _prompt_for_argument(
             "role": "user",
             "content": (
                 "PERTANYAAN DEBAT: " + question + "\n\n"
-                "Argumen sebelumnya:\n" +
-                ("\n".join([f"- {a.author}: {a.content}" for a in prior_arguments]) if prior_arguments else "(Argumen pembuka - belum ada argumen sebelumnya)") +
+                "Argumen sebelumnya:\n" + prior_block +
                 "\n\n**Berikan argumen Anda sekarang. Tetap fokus pada pertanyaan di atas. Jangan melebar.**"
             ),
         },
     ]
-    return _stream_completion(client=client, model=persona.model, messages=messages, on_chunk=on_chunk)
 
 
-def _prompt_for_vote(client: OpenAI, persona: Personality, question: str, arguments: List[Argument]) -> List[str]:
+async def _prompt_for_argument(
+    client: AsyncOpenAI,
+    persona: Personality,
+    question: str,
+    prior_block: str,
+    reasoning_depth: int,
+    rag_system=None,
+    iteration: int = 0,
+    limiter: Optional[asyncio.Semaphore] = None,
+) -> str:
+    if rag_system:
+        # RAG retrieval does blocking embedding/ChromaDB calls; keep them off the event loop
+        messages = await asyncio.to_thread(
+            _argument_messages, persona, question, prior_block, reasoning_depth, rag_system, iteration
+        )
+    else:
+        messages = _argument_messages(persona, question, prior_block, reasoning_depth, rag_system, iteration)
+    return await _stream_completion_async(
+        client=client,
+        model=persona.model,
+        messages=messages,
+        max_chars=persona.max_argument_chars,
+        limiter=limiter,
+    )
+
+
+async def _argument_turn(
+    client: AsyncOpenAI,
+    persona: Personality,
+    position: int,
+    total: int,
+    question: str,
+    prior_block: str,
+    meta: Tuple[str, str],
+    writer: ConsoleWriter,
+    rag_system=None,
+    iteration: int = 0,
+    limiter: Optional[asyncio.Semaphore] = None,
+) -> Argument:
+    content = await _prompt_for_argument(
+        client=client,
+        persona=persona,
+        question=question,
+        prior_block=prior_block,
+        reasoning_depth=persona.reasoning_depth,
+        rag_system=rag_system,
+        iteration=iteration,
+        limiter=limiter,
+    )
+
+    # Queue the whole argument back-to-back so concurrent agents don't interleave
+    color, stats = meta
+    agent_header = f"[bold {color}]{persona.name}[/bold {color}] [dim]({position}/{total})[/dim] {stats}"
+    writer.print(agent_header)
+    writer.print(f"[{color}]▸[/{color}] ", end="")
+    writer.print(content, style=color, end="")
+    writer.print("\n")
+    return Argument(author=persona.name, content=content, iteration=iteration)
+
+
+async def _prompt_for_vote(
+    client: AsyncOpenAI,
+    persona: Personality,
+    question: str,
+    arguments: List[Argument],
+    argument_block: str,
+    limiter: Optional[asyncio.Semaphore] = None,
+) -> List[str]:
     messages = [
         {
             "role": "system",
@@ -113,66 +281,132 @@ def _prompt_for_vote(client: OpenAI, persona: Personality, question: str, argume
             "role": "user",
             "content": (
                 "Pertanyaan: " + question + "\n\n"
-                "Argumen:\n" +
-                "\n".join([f"- {a.author}: {a.content}" for a in arguments]) +
+                "Argumen:\n" + argument_block +
                 "\n\nKembalikan daftar nama penulis, urut terbaik ke terlemah, dipisah koma."
             ),
         },
     ]
-    resp = client.chat.completions.create(model=persona.model, messages=messages)
-    raw = resp.choices[0].message.content.strip()
+    resp = await chat_with_limit(client, limiter=limiter, model=persona.model, messages=messages)
+    raw = (resp.choices[0].message.content or "").strip()
     names = [n.strip() for n in raw.replace("\n", ",").split(",") if n.strip()]
+    return _complete_ranking(names, [a.author for a in arguments])
+
+
+def _complete_ranking(names: List[str], authors: List[str]) -> List[str]:
     # Keep only valid names in order, deduplicate
     valid = []
     seen = set()
-    authors = [a.author for a in arguments]
+    authors_set = set(authors)
     for n in names:
-        if n in authors and n not in seen:
+        if n in authors_set and n not in seen:
             valid.append(n)
             seen.add(n)
+            if len(seen) == len(authors_set):
+                return valid
     # Append missing authors arbitrarily to ensure full ranking
-    for a in authors:
-        if a not in seen:
-            valid.append(a)
+    valid.extend(a for a in authors if a not in seen)
     return valid
 
 
+async def _prompt_for_votes_batched(
+    client: AsyncOpenAI,
+    model: str,
+    personalities: List[Personality],
+    question: str,
+    arguments: List[Argument],
+    argument_block: str,
+    limiter: Optional[asyncio.Semaphore] = None,
+) -> List[List[str]]:
+    """
+    Ask one model to rank the arguments on behalf of every voter in a single call,
+    so the (long) argument block is prefilled once instead of once per voter.
+
+    Falls back to one call per voter when the reply isn't the expected JSON object.
+
+    Returns:
+        Rankings in the same order as personalities
+    """
+    voters = "\n".join(f"- {p.name}: {p.traits}. Perspektif: {p.perspective}" for p in personalities)
+    messages = [
+        {
+            "role": "system",
+            "content": (
+                "Kamu mewakili beberapa pemilih sekaligus. Untuk SETIAP pemilih, lakukan pemeringkatan argumen "
+                "terbaik->terlemah dari sudut pandang pemilih tersebut, berdasarkan kekuatan logika, relevansi, "
+                "dan dukungan bukti.\n\nPemilih:\n" + voters +
+                '\n\nKembalikan HANYA JSON: {"NamaPemilih": ["Penulis1", "Penulis2", ...], ...}'
+            ),
+        },
+        {
+            "role": "user",
+            "content": (
+                "Pertanyaan: " + question + "\n\n"
+                "Argumen:\n" + argument_block +
+                "\n\nKembalikan peringkat semua pemilih dalam format JSON di atas."
+            ),
+        },
+    ]
+    try:
+        resp = await chat_with_limit(
+            client, limiter=limiter, model=model, messages=messages, response_format={"type": "json_object"}
+        )
+        data = json.loads(resp.choices[0].message.content or "")
+        if not isinstance(data, dict):
+            raise ValueError("expected a JSON object")
+    except Exception as e:
+        console.print(f"[yellow]Batched voting failed ({e}); voting per persona[/yellow]")
+        return await asyncio.gather(
+            *[
+                _prompt_for_vote(client, persona, question, arguments, argument_block, limiter=limiter)
+                for persona in personalities
+            ]
+        )
+
+    authors = [a.author for a in arguments]
+    rankings = []
+    for persona in personalities:
+        names = data.get(persona.name)
+        if not isinstance(names, list):
+            names = []
+        rankings.append(_complete_ranking([str(n).strip() for n in names], authors))
+    return rankings
+
+
 def _consensus_from_votes(votes: List[Vote], threshold: float) -> tuple[bool, str | None]:
-    first_place_counts: Dict[str, int] = {}
     total = len(votes)
-    for v in votes:
-        if v.ranking:
-            first = v.ranking[0]
-            first_place_counts[first] = first_place_counts.get(first, 0) + 1
     if not total:
         return False, None
-    # Find top candidate
-    top_candidate, top_count = None, 0
-    for k, cnt in first_place_counts.items():
-        if cnt > top_count:
-            top_candidate, top_count = k, cnt
+    first_place_counts = Counter(v.ranking[0] for v in votes if v.ranking)
+    # Find top candidate (ties go to whoever was counted first)
+    top_candidate, top_count = first_place_counts.most_common(1)[0] if first_place_counts else (None, 0)
     if top_candidate and (top_count / total) >= threshold:
         return True, top_candidate
     return False, top_candidate
 
 
-def _prompt_for_judge(
-    client: OpenAI,
+def _judge_lines(iterations: List[IterationResult]) -> Iterator[str]:
+    """Transcript lines of every iteration (arguments, top-3 votes, consensus)"""
+    for it in iterations:
+        yield f"\n=== Iterasi {it.iteration} ==="
+        for a in it.arguments:
+            yield f"[{a.author}]: {a.content}"
+        yield "\nVoting Iterasi Ini:"
+        for v in it.votes:
+            yield f"  {v.voter} → {' > '.join(v.ranking[:3])}"
+        if it.consensus_reached:
+            yield f"  ✓ Konsensus: {it.consensus_candidate}"
+
+
+async def _prompt_for_judge(
+    client: AsyncOpenAI,
     judge_model: str,
     question: str,
     iterations: List[IterationResult],
     on_chunk: Callable[[str], None],
+    max_chars: Optional[int] = None,
+    limiter: Optional[asyncio.Semaphore] = None,
 ) -> str:
-    flat = []
-    for it in iterations:
-        flat.append(f"\n=== Iterasi {it.iteration} ===")
-        for a in it.arguments:
-            flat.append(f"[{a.author}]: {a.content}")
-        flat.append("\nVoting Iterasi Ini:")
-        for v in it.votes:
-            flat.append(f"  {v.voter} → {' > '.join(v.ranking[:3])}")
-        if it.consensus_reached:
-            flat.append(f"  ✓ Konsensus: {it.consensus_candidate}")
+    transcript = "\n".join(_judge_lines(iterations))
     messages = [
         {
             "role": "system",
@@ -197,25 +431,47 @@ def _prompt_for_judge(
             "role": "user",
             "content": (
                 f"PERTANYAAN DEBAT: {question}\n\n"
-                "=== TRANSKRIP LENGKAP DEBAT ===\n" + "\n".join(flat) +
+                "=== TRANSKRIP LENGKAP DEBAT ===\n" + transcript +
                 "\n\n=== BERIKAN KEPUTUSAN FINAL ANDA ==="
             ),
         },
     ]
-    return _stream_completion(client=client, model=judge_model, messages=messages, on_chunk=on_chunk)
+    return await _stream_completion_async(
+        client=client,
+        model=judge_model,
+        messages=messages,
+        max_chars=max_chars,
+        on_chunk=on_chunk,
+        limiter=limiter,
+    )
 
 
-def _aggregate_ranks(votes: List[Vote]) -> Dict[str, int]:
-    scores: Dict[str, int] = {}
+def _aggregate_ranks(votes: List[Vote]) -> Counter:
+    scores: Counter = Counter()
     for v in votes:
-        for idx, name in enumerate(v.ranking):
-            scores[name] = scores.get(name, 0) + (idx + 1)  # rank 1 -> 1 point
+        scores.update({name: idx for idx, name in enumerate(v.ranking, 1)})  # rank 1 -> 1 point
     return scores
 
 
 def run_debate(config: DebateConfig, personalities: List[Personality], save_callback=None, elimination: bool = False, rag_system=None) -> DebateState:
+    return run_async(
+        run_debate_async(
+            config=config,
+            personalities=personalities,
+            save_callback=save_callback,
+            elimination=elimination,
+            rag_system=rag_system,
+        )
+    )
+
+
+async def run_debate_async(config: DebateConfig, personalities: List[Personality], save_callback=None, elimination: bool = False, rag_system=None) -> DebateState:
     state = DebateState(config=config, personalities=personalities)
+    # This debate's own cap; without one, requests share the process-wide limit.
+    # Never reset the global semaphore here: other debates on this loop may hold it.
+    limiter = asyncio.Semaphore(config.max_concurrency) if config.max_concurrency else None
     client = get_ollama_client()
+    async_client = get_async_ollama_client()
 
     # Display debate header
     rag_status = "Enabled" if rag_system and rag_system.config.enabled else "Disabled"
@@ -230,149 +486,192 @@ def run_debate(config: DebateConfig, personalities: List[Personality], save_call
     console.print(Panel(header_content, title="🏛️  DEBATE COUNCIL", border_style="bold blue", expand=False))
     console.print()
 
-    # Iterations: opening arguments first
-    for i in range(0, config.max_iterations):
-        console.rule(f"[bold]Iterasi {i}[/bold]")
-        prior_args: List[Argument] = []
-        if state.iterations:
-            # Prior arguments are from previous iteration for context
-            prior_args = state.iterations[-1].arguments
-
-        arguments: List[Argument] = []
-        console.print(f"[dim]Debaters: {', '.join([p.name for p in personalities])}[/dim]\n")
-
-        for idx, persona in enumerate(personalities, 1):
-            color = _color_for(persona.name)
-
-            # Agent header with metadata
-            agent_header = (
-                f"[bold {color}]{persona.name}[/bold {color}] "
-                f"[dim]({idx}/{len(personalities)})[/dim] "
-                f"[dim italic]│ Depth:{persona.reasoning_depth} Truth:{persona.truth_seeking:.2f}[/dim italic]"
+    persona_meta = {p.name: _persona_meta(p) for p in personalities}
+    writer = ConsoleWriter(console)
+    checkpointer = _Checkpointer(save_callback) if save_callback else None
+
+    try:
+        # Iterations: opening arguments first
+        for i in range(0, config.max_iterations):
+            console.rule(f"[bold]Iterasi {i}[/bold]")
+            prior_args: List[Argument] = []
+            if state.iterations:
+                # Prior arguments are from previous iteration for context; drop eliminated
+                # debaters so their text isn't re-sent every round
+                active_names = {p.name for p in personalities}
+                prior_args = [a for a in state.iterations[-1].arguments if a.author in active_names]
+
+            console.print(f"[dim]Debaters: {', '.join([p.name for p in personalities])}[/dim]\n")
+
+            # Shared by every debater this round; serialized once and kept ahead of the
+            # persona-specific instruction so the common prompt text stays identical
+            prior_block = _argument_listing(prior_args) if prior_args else OPENING_PRIOR_BLOCK
+
+            # All debaters argue concurrently; arguments keep the persona order
+            results = await asyncio.gather(
+                *[
+                    _argument_turn(
+                        client=async_client,
+                        persona=persona,
+                        position=idx,
+                        total=len(personalities),
+                        question=config.question,
+                        prior_block=prior_block,
+                        meta=persona_meta[persona.name],
+                        writer=writer,
+                        rag_system=rag_system,
+                        iteration=i,
+                        limiter=limiter,
+                    )
+                    for idx, persona in enumerate(personalities, 1)
+                ],
+                return_exceptions=True,
             )
-            console.print(agent_header)
-            console.print(f"[{color}]▸[/{color}] ", end="")
-
-            content = _prompt_for_argument(
-                client=client,
-                persona=persona,
-                question=config.question,
-                prior_arguments=prior_args if i > 0 else [],
-                reasoning_depth=persona.reasoning_depth,
-                on_chunk=lambda chunk, _color=color: console.print(chunk, style=_color, end=""),
-                rag_system=rag_system,
-                iteration=i,
+            await writer.flush()
+            for result in results:
+                if isinstance(result, BaseException):
+                    raise result
+            arguments: List[Argument] = list(results)
+
+            # Focus scoring (how on-topic each argument is) and voting only depend on
+            # the arguments, so run both stages together and report once they finish
+            console.print("\n[dim]Evaluating focus scores & collecting votes...[/dim]")
+            argument_pairs = [(arg.author, arg.content) for arg in arguments]
+            argument_block = _argument_listing(arguments)
+            focus_task = asyncio.to_thread(
+                batch_score_arguments, client, config.question, argument_pairs, threshold=0.65
             )
-            console.print("\n")
-            arguments.append(Argument(author=persona.name, content=content, iteration=i))
-
-        # Focus scoring: evaluate how on-topic each argument is
-        console.print("\n[dim]Evaluating focus scores...[/dim]")
-        argument_pairs = [(arg.author, arg.content) for arg in arguments]
-        focus_scores = batch_score_arguments(client, config.question, argument_pairs, threshold=0.65)
-
-        # Display focus warnings if any
-        warnings = get_focus_warnings(focus_scores, threshold=0.65)
-        if warnings:
-            console.print("\n[yellow]Focus Warnings:[/yellow]")
-            for warning in warnings:
-                console.print(f"  {warning}")
-        else:
-            console.print("[green]✓ Semua argumen fokus dan relevan[/green]")
-
-        votes: List[Vote] = []
-        # Voting begins after first arguments are visible
-        for persona in personalities:
-            ranking = _prompt_for_vote(
-                client=client,
-                persona=persona,
-                question=config.question,
+            if config.batched_voting:
+                votes_task = _prompt_for_votes_batched(
+                    client=async_client,
+                    model=config.judge_model,
+                    personalities=personalities,
+                    question=config.question,
+                    arguments=arguments,
+                    argument_block=argument_block,
+                    limiter=limiter,
+                )
+            else:
+                votes_task = asyncio.gather(
+                    *[
+                        _prompt_for_vote(
+                            client=async_client,
+                            persona=persona,
+                            question=config.question,
+                            arguments=arguments,
+                            argument_block=argument_block,
+                            limiter=limiter,
+                        )
+                        for persona in personalities
+                    ]
+                )
+            focus_scores, rankings = await asyncio.gather(focus_task, votes_task)
+
+            # Display focus warnings if any
+            warnings = get_focus_warnings(focus_scores, threshold=0.65)
+            if warnings:
+                console.print("\n[yellow]Focus Warnings:[/yellow]")
+                for warning in warnings:
+                    console.print(f"  {warning}")
+            else:
+                console.print("[green]✓ Semua argumen fokus dan relevan[/green]")
+
+            votes: List[Vote] = [
+                Vote(voter=persona.name, ranking=ranking, iteration=i)
+                for persona, ranking in zip(personalities, rankings)
+            ]
+
+            consensus, candidate = _consensus_from_votes(votes, threshold=config.consensus_threshold)
+            it_result = IterationResult(
+                iteration=i,
                 arguments=arguments,
+                votes=votes,
+                consensus_reached=consensus,
+                consensus_candidate=candidate,
             )
-            votes.append(Vote(voter=persona.name, ranking=ranking, iteration=i))
-
-        consensus, candidate = _consensus_from_votes(votes, threshold=config.consensus_threshold)
-        it_result = IterationResult(
-            iteration=i,
-            arguments=arguments,
-            votes=votes,
-            consensus_reached=consensus,
-            consensus_candidate=candidate,
-        )
-        state.iterations.append(it_result)
-
-        # Save after each iteration (checkpoint)
-        if save_callback:
-            save_callback(state)
-
-        # Elimination step: drop worst performer by aggregate rank
-        if elimination and len(personalities) > 2:
-            ranks = _aggregate_ranks(votes)
-            # Highest score = worst
-            worst = max(ranks.items(), key=lambda kv: kv[1])[0]
-            console.print(f"[red]Eliminasi:[/red] {worst}")
-            personalities = [p for p in personalities if p.name != worst]
-
-        # Respect min_iterations before early stop
-        if consensus and i + 1 >= config.min_iterations:
-            break
-
-    console.print("\n[bold]Hakim menyimpulkan...[/bold]", justify="left")
-    decision = _prompt_for_judge(
-        client=client,
-        judge_model=config.judge_model,
-        question=config.question,
-        iterations=state.iterations,
-        on_chunk=lambda chunk: console.print(chunk, style="bold white", end=""),
-    )
-    console.print()
-    state.judge_decision = decision
-    if save_callback:
-        save_callback(state)
-
-    # Render final voting table with enhanced information
-    console.print("\n")
-    table = Table(title="📊 Hasil Voting Terakhir", border_style="cyan", show_header=True, header_style="bold cyan")
-    table.add_column("Pemilih", style="bold")
-    table.add_column("Peringkat Top 3", style="dim")
-    table.add_column("First Choice", style="bold green")
-
-    for v in state.iterations[-1].votes:
-        voter_color = _color_for(v.voter)
-        top3 = " → ".join(v.ranking[:3]) if len(v.ranking) >= 3 else " → ".join(v.ranking)
-        first = v.ranking[0] if v.ranking else "N/A"
-        table.add_row(
-            f"[{voter_color}]{v.voter}[/{voter_color}]",
-            top3,
-            first
+            state.iterations.append(it_result)
+
+            # Save after each iteration (checkpoint)
+            if checkpointer:
+                checkpointer.submit(state)
+
+            # Elimination step: drop worst performer by aggregate rank
+            if elimination and len(personalities) > 2:
+                ranks = _aggregate_ranks(votes)
+                # Highest score = worst
+                worst = ranks.most_common(1)[0][0]
+                console.print(f"[red]Eliminasi:[/red] {worst}")
+                personalities = [p for p in personalities if p.name != worst]
+
+            # Respect min_iterations before early stop
+            if consensus and i + 1 >= config.min_iterations:
+                break
+
+        console.print("\n[bold]Hakim menyimpulkan...[/bold]", justify="left")
+        # Async stream so a server hosting the debate keeps serving during the verdict
+        decision = await _prompt_for_judge(
+            client=async_client,
+            judge_model=config.judge_model,
+            question=config.question,
+            iterations=state.iterations,
+            on_chunk=lambda chunk: writer.print(chunk, style="bold white", end=""),
+            max_chars=config.judge_max_chars,
+            limiter=limiter,
         )
+        await writer.flush()
+        console.print()
+        state.judge_decision = decision
+        if checkpointer:
+            checkpointer.submit(state)
+
+        # Render final voting table with enhanced information
+        console.print("\n")
+        table = Table(title="📊 Hasil Voting Terakhir", border_style="cyan", show_header=True, header_style="bold cyan")
+        table.add_column("Pemilih", style="bold")
+        table.add_column("Peringkat Top 3", style="dim")
+        table.add_column("First Choice", style="bold green")
+
+        for v in state.iterations[-1].votes:
+            voter_color = _color_for(v.voter)
+            top3 = " → ".join(v.ranking[:3]) if len(v.ranking) >= 3 else " → ".join(v.ranking)
+            first = v.ranking[0] if v.ranking else "N/A"
+            table.add_row(
+                f"[{voter_color}]{v.voter}[/{voter_color}]",
+                top3,
+                first
+            )
 
-    console.print(table)
-    console.print()
-
-    # Show consensus status
-    last_iter = state.iterations[-1]
-    if last_iter.consensus_reached:
-        consensus_panel = Panel(
-            f"✅ **Konsensus tercapai!**\n\n"
-            f"Kandidat pemenang: **{last_iter.consensus_candidate}**\n"
-            f"Tercapai pada iterasi: {last_iter.iteration}",
-            title="Consensus Status",
-            border_style="bold green"
-        )
-        console.print(consensus_panel)
-    else:
-        consensus_panel = Panel(
-            f"⚠️  **Konsensus tidak tercapai**\n\n"
-            f"Kandidat terdepan: {last_iter.consensus_candidate or 'N/A'}\n"
-            f"Maksimal iterasi tercapai: {len(state.iterations)}",
-            title="Consensus Status",
-            border_style="bold yellow"
-        )
-        console.print(consensus_panel)
-
-    console.print()
-    console.print(Panel(decision, title="⚖️  Keputusan Hakim Final", border_style="bold white"))
-    return state
+        console.print(table)
+        console.print()
+
+        # Show consensus status
+        last_iter = state.iterations[-1]
+        if last_iter.consensus_reached:
+            consensus_panel = Panel(
+                f"✅ **Konsensus tercapai!**\n\n"
+                f"Kandidat pemenang: **{last_iter.consensus_candidate}**\n"
+                f"Tercapai pada iterasi: {last_iter.iteration}",
+                title="Consensus Status",
+                border_style="bold green"
+            )
+            console.print(consensus_panel)
+        else:
+            consensus_panel = Panel(
+                f"⚠️  **Konsensus tidak tercapai**\n\n"
+                f"Kandidat terdepan: {last_iter.consensus_candidate or 'N/A'}\n"
+                f"Maksimal iterasi tercapai: {len(state.iterations)}",
+                title="Consensus Status",
+                border_style="bold yellow"
+            )
+            console.print(consensus_panel)
+
+        console.print()
+        console.print(Panel(decision, title="⚖️  Keputusan Hakim Final", border_style="bold white"))
+        return state
+    finally:
+        # Also on failure: stop the console thread and get the last checkpoint on disk
+        await writer.close()
+        if checkpointer:
+            await checkpointer.wait()
 
 
@@ -2,12 +2,13 @@ from __future__ import annotations
 
 import json
 import math
+import time
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import List, Optional, Dict, Any, Set
 
-from .chroma_memory import ChromaCouncilMemory, MemoryRecord, embed_text
+from .chroma_memory import ChromaCouncilMemory, MemoryRecord, embed_text, metadata_timestamp, utc_from_timestamp
 from langfuse.openai import OpenAI
 
 
@@ -77,8 +78,11 @@ class EnhancedCouncilMemory(ChromaCouncilMemory):
             raise ValueError("Embedding required for enhanced memory")
 
         # Prepare enhanced metadata
+        ts = time.time()
+        timestamp = utc_from_timestamp(ts).isoformat()
         metadata = {
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": timestamp,
+            "ts": ts,
             "question": question,
             "agent": agent,
             "role": role,
@@ -87,14 +91,14 @@ class EnhancedCouncilMemory(ChromaCouncilMemory):
             "category": category,
             "importance": importance,
             "access_count": 0,
-            "last_accessed": datetime.utcnow().isoformat(),
+            "last_accessed": timestamp,
         }
 
         if extra_metadata:
             metadata.update(extra_metadata)
 
         # Generate unique ID
-        doc_id = f"{role}_{phase}_{category}_{datetime.utcnow().timestamp()}_{self._doc_counter}"
+        doc_id = f"{role}_{phase}_{category}_{ts}_{self._doc_counter}"
         self._doc_counter += 1
 
         # Add to ChromaDB
@@ -104,6 +108,7 @@ class EnhancedCouncilMemory(ChromaCouncilMemory):
             documents=[content],
             metadatas=[metadata],
         )
+        self._remember_added([doc_id], [embedding], [content], [metadata])
 
         return doc_id
 
@@ -143,7 +148,7 @@ class EnhancedCouncilMemory(ChromaCouncilMemory):
 
         for i in range(len(results['ids'][0])):
             metadata = results['metadatas'][0][i]
-            timestamp = datetime.fromisoformat(metadata['timestamp'])
+            timestamp = metadata_timestamp(metadata)
 
             # Calculate decay
             age_days = (now - timestamp).days
@@ -248,18 +253,18 @@ class EnhancedCouncilMemory(ChromaCouncilMemory):
             by_category[category].append((score, record))
 
         # Synthesize insights
-        synthesis_prompt = f"Topic: {topic}\n\nMemori relevan dari debat sebelumnya:\n\n"
-
+        lines = [f"Topic: {topic}\n\nMemori relevan dari debat sebelumnya:\n\n"]
         for category, memories in by_category.items():
-            synthesis_prompt += f"\n### {category.title()}:\n"
-            for score, mem in memories[:3]:  # Top 3 per category
-                synthesis_prompt += f"- [{mem.agent}]: {mem.content[:200]}...\n"
-
-        synthesis_prompt += (
+            lines.append(f"\n### {category.title()}:\n")
+            lines.extend(
+                f"- [{mem.agent}]: {mem.content[:200]}...\n" for _, mem in memories[:3]  # Top 3 per category
+            )
+        lines.append(
             "\n\nBerdasarkan memori di atas, ekstrak 3-5 insight kunci yang dapat membantu "
             "debat baru tentang topik ini. Format:\n"
             "1. [Insight]\n2. [Insight]\n..."
         )
+        synthesis_prompt = "".join(lines)
 
         try:
             response = client.chat.completions.create(
@@ -357,6 +362,9 @@ class EnhancedCouncilMemory(ChromaCouncilMemory):
                     metadatas=[metadata],
                 )
 
+            # Imported episodes carry their original timestamps; reload the recent buffer
+            self._recent_loaded = False
+            self._reset_matrix()
             print(f"✓ Imported {len(memories)} memories from {import_path}")
 
         except Exception as e:
@@ -392,7 +400,7 @@ class EnhancedCouncilMemory(ChromaCouncilMemory):
                 total_importance += metadata.get('importance', 0.5)
 
                 # Age
-                timestamp = datetime.fromisoformat(metadata['timestamp'])
+                timestamp = metadata_timestamp(metadata)
                 age_days = (now - timestamp).days
                 avg_age_days += age_days
 
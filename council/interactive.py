@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from datetime import datetime
+from datetime import datetime, timezone
 from pathlib import Path
 from typing import List, Optional, Literal, Callable
 
@@ -9,7 +9,7 @@ from rich.console import Console
 from rich.markdown import Markdown
 from rich.prompt import Prompt, Confirm, IntPrompt
 
-from .types import DebateConfig, Personality, DebateState
+from .types import CONSENSUS_THRESHOLDS, DebateConfig, Personality, DebateState
 from .personalities import default_personalities
 from .engine import run_debate
 from .consciousness import run_council_of_consciousness, CouncilConfig
@@ -45,7 +45,7 @@ def _choose_consensus() -> Literal["majority", "supermajority", "unanimity"]:
 def _mk_markdown_writer(title: Optional[str]) -> Callable[[DebateState], None]:
     out_dir = Path("debates")
     out_dir.mkdir(parents=True, exist_ok=True)
-    ts = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+    ts = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
     base = (title or "Debate").replace(" ", "_")[:48]
     md_path = out_dir / f"{ts}_{base}.md"
 
@@ -96,20 +96,13 @@ def run_interactive() -> None:
     all_personas = default_personalities()
     chosen_personas = _choose_personalities(all_personas)
 
-    if consensus == "majority":
-        threshold = 0.5
-    elif consensus == "supermajority":
-        threshold = 2.0 / 3.0
-    else:
-        threshold = 1.0
-
     config = DebateConfig(
         title=title,
         question=question,
         judge_model="gemma3:1b",
         min_iterations=min_it,
         max_iterations=max_it,
-        consensus_threshold=threshold,
+        consensus_threshold=CONSENSUS_THRESHOLDS[consensus],
     )
 
     console.print(Markdown("### Mulai Debat"))
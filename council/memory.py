@@ -1,13 +1,13 @@
 from __future__ import annotations
 
 import json
-import math
 import sqlite3
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import List, Optional, Iterable, Dict
+from typing import List, Optional, Iterable, Dict, Union
 
+import numpy as np
 from langfuse.openai import OpenAI
 
 EMBED_MODEL = "granite-embedding:latest"
@@ -124,40 +124,53 @@ class CouncilMemory:
             WHERE embedding IS NOT NULL
             """
         )
-        scored: List[tuple[float, MemoryRecord]] = []
-        for row in cur.fetchall():
-            emb = json.loads(row[7])
-            score = cosine_similarity(query_embedding, emb)
-            scored.append(
-                (
-                    score,
-                    MemoryRecord(
-                        id=row[0],
-                        timestamp=datetime.fromisoformat(row[1]),
-                        question=row[2],
-                        agent=row[3],
-                        role=row[4],
-                        phase=row[5],
-                        content=row[6],
-                        embedding=emb,
-                    ),
-                )
+        rows = cur.fetchall()
+        if not rows or limit <= 0:
+            return []
+
+        embeddings = [json.loads(row[7]) for row in rows]
+        q = np.asarray(query_embedding, dtype=np.float32)
+        if all(len(emb) == q.shape[0] for emb in embeddings):
+            # One matrix-vector product scores every episode
+            matrix = np.asarray(embeddings, dtype=np.float32)
+            denom = np.linalg.norm(matrix, axis=1) * np.linalg.norm(q)
+            scores = np.divide(matrix @ q, denom, out=np.zeros_like(denom), where=denom > 0)
+        else:
+            # Episodes from a different embedding model can't be stacked
+            scores = np.array([cosine_similarity(q, emb) for emb in embeddings], dtype=np.float32)
+
+        k = min(limit, len(rows))
+        top = np.argpartition(scores, -k)[-k:]
+        top = top[np.argsort(scores[top])[::-1]]
+
+        return [
+            MemoryRecord(
+                id=rows[i][0],
+                timestamp=datetime.fromisoformat(rows[i][1]),
+                question=rows[i][2],
+                agent=rows[i][3],
+                role=rows[i][4],
+                phase=rows[i][5],
+                content=rows[i][6],
+                embedding=embeddings[i],
             )
-        scored.sort(key=lambda x: x[0], reverse=True)
-        return [record for _, record in scored[:limit]]
-
-
-def cosine_similarity(a: Iterable[float], b: Iterable[float]) -> float:
-    dot = 0.0
-    norm_a = 0.0
-    norm_b = 0.0
-    for x, y in zip(a, b):
-        dot += x * y
-        norm_a += x * x
-        norm_b += y * y
-    if not norm_a or not norm_b:
+            for i in top
+        ]
+
+
+def cosine_similarity(
+    a: Union[Iterable[float], np.ndarray],
+    b: Union[Iterable[float], np.ndarray],
+) -> float:
+    a = np.asarray(a, dtype=np.float32)
+    b = np.asarray(b, dtype=np.float32)
+    # Like zip(), score over the shared prefix when dimensions differ
+    n = min(a.shape[0], b.shape[0])
+    a, b = a[:n], b[:n]
+    denom = np.linalg.norm(a) * np.linalg.norm(b)
+    if not denom:
         return 0.0
-    return dot / math.sqrt(norm_a * norm_b)
+    return float(a @ b / denom)
 
 
 def embed_text(client: OpenAI, text: str) -> List[float]:
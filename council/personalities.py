@@ -1,8 +1,14 @@
-from typing import List
+from functools import lru_cache
+from typing import List, Tuple
 from .types import Personality
 
 
 def default_personalities() -> List[Personality]:
+    return list(_default_personalities())
+
+
+@lru_cache(maxsize=1)
+def _default_personalities() -> Tuple[Personality, ...]:
     base = [
         Personality(
             name="Strategist Prime",
@@ -126,6 +132,6 @@ def default_personalities() -> List[Personality]:
         ),
     ]
 
-    return base + specialized
+    return tuple(base + specialized)
 
 
@@ -2,8 +2,9 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from pathlib import Path
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Set
 import json
+import threading
 
 from langfuse.openai import OpenAI
 from .enhanced_memory import EnhancedCouncilMemory, embed_text
@@ -37,9 +38,25 @@ class RAGSystem:
         client: Optional[OpenAI] = None,
     ):
         self.config = config
-        self.memory = memory or EnhancedCouncilMemory()
+        self._memory = memory
+        self._memory_lock = threading.Lock()
         self.client = client
         self.external_docs_index: Dict[str, str] = {}  # doc_id -> content
+        self.external_docs_keywords: Dict[str, Set[str]] = {}  # doc_id -> lowercased words
+
+    @property
+    def memory(self) -> EnhancedCouncilMemory:
+        """Debate memory, opened on first use so ChromaDB is only touched when queried"""
+        if self._memory is None:
+            # Agents retrieve from worker threads concurrently; open the store only once
+            with self._memory_lock:
+                if self._memory is None:
+                    self._memory = EnhancedCouncilMemory()
+        return self._memory
+
+    def _index_document(self, doc_id: str, content: str) -> None:
+        self.external_docs_index[doc_id] = content
+        self.external_docs_keywords[doc_id] = set(content.lower().split())
 
     def load_external_documents(self, docs_path: Path) -> int:
         """
@@ -63,7 +80,7 @@ class RAGSystem:
         for file_path in docs_path.glob("*.txt"):
             try:
                 content = file_path.read_text(encoding='utf-8')
-                self.external_docs_index[file_path.stem] = content
+                self._index_document(file_path.stem, content)
                 count += 1
             except Exception as e:
                 print(f"Error loading {file_path}: {e}")
@@ -72,7 +89,7 @@ class RAGSystem:
         for file_path in docs_path.glob("*.md"):
             try:
                 content = file_path.read_text(encoding='utf-8')
-                self.external_docs_index[file_path.stem] = content
+                self._index_document(file_path.stem, content)
                 count += 1
             except Exception as e:
                 print(f"Error loading {file_path}: {e}")
@@ -84,7 +101,7 @@ class RAGSystem:
                     data = json.load(f)
                     # Convert JSON to text
                     content = json.dumps(data, indent=2)
-                    self.external_docs_index[file_path.stem] = content
+                    self._index_document(file_path.stem, content)
                 count += 1
             except Exception as e:
                 print(f"Error loading {file_path}: {e}")
@@ -115,7 +132,7 @@ class RAGSystem:
         context_parts = []
 
         # 1. Retrieve from memory
-        if self.config.use_memory and self.memory and self.client:
+        if self.config.use_memory and self.client and self.memory:
             try:
                 query_embedding = embed_text(self.client, question)
 
@@ -146,12 +163,11 @@ class RAGSystem:
             question_keywords = set(question.lower().split())
 
             relevant_docs = []
-            for doc_id, content in self.external_docs_index.items():
-                doc_keywords = set(content.lower().split())
+            for doc_id, doc_keywords in self.external_docs_keywords.items():
                 overlap = len(question_keywords.intersection(doc_keywords))
 
                 if overlap >= 2:  # At least 2 keywords match
-                    relevant_docs.append((doc_id, content, overlap))
+                    relevant_docs.append((doc_id, self.external_docs_index[doc_id], overlap))
 
             # Sort by relevance
             relevant_docs.sort(key=lambda x: x[2], reverse=True)
@@ -229,7 +245,7 @@ CATATAN RAG:
             doc_id: Document identifier
             content: Document content
         """
-        self.external_docs_index[doc_id] = content
+        self._index_document(doc_id, content)
         print(f"Added document '{doc_id}' to RAG index")
 
     def get_rag_stats(self) -> Dict[str, Any]:
@@ -249,6 +265,8 @@ def create_rag_system(
     use_memory: bool = True,
     external_docs_path: Optional[Path] = None,
     client: Optional[OpenAI] = None,
+    retrieval_limit: int = 3,
+    min_similarity: float = 0.6,
 ) -> RAGSystem:
     """
     Factory function to create RAG system
@@ -258,6 +276,8 @@ def create_rag_system(
         use_memory: Use debate memory
         external_docs_path: Path to external documents
         client: OpenAI client for embeddings
+        retrieval_limit: Max items retrieved per source
+        min_similarity: Minimum similarity for retrieved items
 
     Returns:
         Configured RAGSystem
@@ -267,12 +287,12 @@ def create_rag_system(
         use_memory=use_memory,
         use_external_docs=external_docs_path is not None,
         external_docs_path=external_docs_path,
-        retrieval_limit=3,
-        min_similarity=0.6,
+        retrieval_limit=retrieval_limit,
+        min_similarity=min_similarity,
     )
 
-    memory = EnhancedCouncilMemory() if use_memory else None
-    rag = RAGSystem(config, memory, client)
+    # Memory is opened lazily by RAGSystem on first retrieval
+    rag = RAGSystem(config, None, client)
 
     if external_docs_path:
         rag.load_external_documents(external_docs_path)
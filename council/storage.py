@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 import json
-from datetime import datetime
+from datetime import datetime, timezone
 from pathlib import Path
 from .types import DebateState
 
@@ -12,7 +12,7 @@ def ensure_dir(path: Path) -> None:
 
 def autosave_json(state: DebateState, out_dir: Path = Path("debates")) -> None:
     ensure_dir(out_dir)
-    ts = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+    ts = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
     title = (state.config.title or "Debate").replace(" ", "_")[:48]
     filename = f"{ts}_{title}.json"
     tmp = out_dir / (filename + ".tmp")
@@ -11,6 +11,7 @@ class Personality(BaseModel):
     persistence: float = Field(0.5, ge=0.0, le=1.0)  # resistance to change
     reasoning_depth: int = 1
     truth_seeking: float = Field(0.7, ge=0.0, le=1.0)
+    max_argument_chars: Optional[int] = Field(None, ge=1)  # stop streaming an argument past this length
 
 
 class Argument(BaseModel):
@@ -34,6 +35,14 @@ class IterationResult(BaseModel):
     consensus_candidate: Optional[str] = None
 
 
+# Consensus presets -> fraction of first-place votes required
+CONSENSUS_THRESHOLDS: Dict[str, float] = {
+    "majority": 0.5,
+    "supermajority": 2.0 / 3.0,
+    "unanimity": 1.0,
+}
+
+
 class DebateConfig(BaseModel):
     title: Optional[str] = None
     question: str
@@ -41,6 +50,12 @@ class DebateConfig(BaseModel):
     min_iterations: int = 2
     max_iterations: int = 5
     consensus_threshold: float = 0.6  # fraction of first-place votes
+    # Max in-flight LLM requests for this debate (its own semaphore); None shares the
+    # process-wide limit (COUNCIL_MAX_CONCURRENCY / set_concurrency)
+    max_concurrency: Optional[int] = Field(None, ge=1)
+    # One judge_model call ranks for every voter instead of one call per persona
+    batched_voting: bool = False
+    judge_max_chars: Optional[int] = Field(None, ge=1)  # stop streaming the verdict past this length
 
 
 class DebateState(BaseModel):
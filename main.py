@@ -70,11 +70,8 @@ def chat_stream_repl(client: OpenAI, model: str, system_prompt: str) -> None:
             )
             for event in stream:
                 # Each chunk may contain delta content
-                try:
-                    delta = event.choices[0].delta.content or ""
-                except Exception:
-                    # Some SDK versions may use a slightly different schema; fallback gracefully
-                    delta = ""
+                choices = event.choices  # Empty on usage-only chunks
+                delta = getattr(choices[0].delta, "content", None) if choices else None
                 if delta:
                     full_content_parts.append(delta)
                     sys.stdout.write(delta)
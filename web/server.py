@@ -16,10 +16,9 @@ from pydantic import BaseModel
 from council.types import DebateConfig, Personality
 from council.personalities import default_personalities
 from council.storage import autosave_json
-from council.engine import run_debate
+from council.engine import run_debate_async
 from council.clients import get_ollama_client
-from council.rag_system import RAGSystem, RAGConfig
-from council.enhanced_memory import EnhancedCouncilMemory
+from council.rag_system import create_rag_system
 
 
 # Global state
@@ -341,26 +340,14 @@ async def start_debate_api(request: DebateStartRequest):
         # Initialize RAG system if enabled
         rag_system = None
         if request.rag_enabled and request.rag_config:
-            client = get_ollama_client()
-            memory = EnhancedCouncilMemory() if request.rag_config.use_memory else None
-
-            rag_config = RAGConfig(
-                enabled=True,
+            rag_system = create_rag_system(
                 use_memory=request.rag_config.use_memory,
-                use_external_docs=request.rag_config.use_external_docs,
                 external_docs_path=Path("docs") if request.rag_config.use_external_docs else None,
+                client=get_ollama_client(),
                 retrieval_limit=request.rag_config.retrieval_limit,
                 min_similarity=request.rag_config.min_similarity,
             )
 
-            rag_system = RAGSystem(rag_config, memory, client)
-
-            # Load external docs if enabled
-            if request.rag_config.use_external_docs:
-                docs_path = Path("docs")
-                if docs_path.exists():
-                    rag_system.load_external_documents(docs_path)
-
         # Handle different debate modes
         # TODO: Implement mode routing for council, collaboration, oxford, etc.
         if request.mode != "debate":
@@ -368,8 +355,8 @@ async def start_debate_api(request: DebateStartRequest):
             # Other modes will be implemented in future updates
             print(f"Warning: Mode '{request.mode}' not yet implemented, using standard debate")
 
-        # Run debate (blocking - in production, use background task)
-        state = run_debate(
+        # Run debate on the server's event loop (argument rounds run concurrently)
+        state = await run_debate_async(
             config=config,
             personalities=personalities,
             save_callback=autosave_json,